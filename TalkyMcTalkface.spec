@@ -41,9 +41,11 @@ hidden_imports = [
     'uvicorn.logging',
     'uvicorn.loops',
     'uvicorn.loops.auto',
+    'uvicorn.loops.uvloop',
     'uvicorn.protocols',
     'uvicorn.protocols.http',
     'uvicorn.protocols.http.auto',
+    'uvicorn.protocols.http.httptools_impl',
     'uvicorn.protocols.websockets',
     'uvicorn.protocols.websockets.auto',
     'uvicorn.lifespan',
@@ -56,6 +58,8 @@ hidden_imports = [
     'pydantic_core',
     'anyio',
     'anyio._backends._asyncio',
+    'uvloop',
+    'httptools',
 
     # Database
     'sqlalchemy',
@@ -103,6 +107,9 @@ hidden_imports = [
     'httpx',
     'httpcore',
 
+    # Voices directory watcher
+    'watchfiles',
+
     # App modules
     'app',
     'app.config',
@@ -119,6 +126,7 @@ hidden_imports = [
     'app.services',
     'app.services.tts_service',
     'app.services.job_processor',
+    'app.services.job_batcher',
 ]
 
 # Collect all submodules for complex packages
@@ -0,0 +1,33 @@
+"""
+Small in-process caches for hot polling endpoints.
+"""
+import time
+from typing import Any, Callable, Optional
+
+
+class TTLCache:
+    """
+    Holds a single value for a fixed number of seconds.
+
+    Used to serve tight polling loops from memory instead of rebuilding
+    the same response on every request.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Optional[Any] = None
+        self._expires_at = 0.0
+
+    def get(self, build: Callable[[], Any]) -> Any:
+        """Return the cached value, calling build() if it is missing or stale."""
+        now = time.monotonic()
+        if self._value is not None and now < self._expires_at:
+            return self._value
+        self._value = build()
+        self._expires_at = now + self.ttl
+        return self._value
+
+    def clear(self):
+        """Drop the cached value so the next get() rebuilds it."""
+        self._value = None
+        self._expires_at = 0.0
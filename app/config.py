@@ -1,8 +1,12 @@
 """
 Application configuration and paths.
 """
+import logging
+import os
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Application identity
 APP_NAME = 'TalkyMcTalkface'
 APP_VERSION = '0.1.0'
@@ -11,6 +15,16 @@ APP_VERSION = '0.1.0'
 SERVER_HOST = '127.0.0.1'
 SERVER_PORT = 5111
 
+# Log level for the server's own messages (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+LOG_LEVEL = os.getenv('TALKY_LOG_LEVEL', 'INFO').upper()
+if LOG_LEVEL not in LOG_LEVELS:
+    logger.warning(
+        'Unknown TALKY_LOG_LEVEL %r, using INFO (expected one of %s)',
+        LOG_LEVEL, ', '.join(LOG_LEVELS),
+    )
+    LOG_LEVEL = 'INFO'
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent.parent
 
@@ -37,9 +51,36 @@ MODEL_DEVICE = 'mps'  # Metal Performance Shaders for Apple Silicon
 # Clear GPU cache after each generation (reduces peak memory, slight overhead)
 MODEL_AGGRESSIVE_MEMORY = True
 
+# Run a short throwaway generation at startup so the first job skips device warm-up
+MODEL_WARMUP = os.getenv('MODEL_WARMUP', '0') == '1'
+
+# Compile the model's transformer with torch.compile at load time (experimental;
+# implies warm-up, since the first generation pays the compile cost)
+TORCH_COMPILE = os.getenv('TALKY_TORCH_COMPILE', '0') == '1'
+
+# Precision for speech-token generation: 'fp32' (default), 'fp16' or 'bf16'
+MODEL_PRECISIONS = ('fp32', 'fp16', 'bf16')
+MODEL_PRECISION = os.getenv('TALKY_PRECISION', 'fp32').lower()
+if MODEL_PRECISION not in MODEL_PRECISIONS:
+    logger.warning(
+        'Unknown TALKY_PRECISION %r, using fp32 (expected one of %s)',
+        MODEL_PRECISION, ', '.join(MODEL_PRECISIONS),
+    )
+    MODEL_PRECISION = 'fp32'
+
+# Job queue: maximum number of jobs waiting to be processed
+JOB_QUEUE_MAX = int(os.getenv('JOB_QUEUE_MAX', '1024'))
+
+
+# Set once the directories have been created in this process
+_dirs_ready = False
+
 
 def ensure_directories():
-    """Create required directories if they don't exist."""
-    APP_SUPPORT_DIR.mkdir(parents=True, exist_ok=True)
-    AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-    VOICES_DIR.mkdir(parents=True, exist_ok=True)
+    """Create required directories if they don't exist (once per process)."""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    for directory in (APP_SUPPORT_DIR, AUDIO_DIR, VOICES_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+    _dirs_ready = True
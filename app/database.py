@@ -1,42 +1,152 @@
 """
 Async database setup with SQLAlchemy and aiosqlite.
 """
+import uuid
+
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import event, text
 
 from app.config import DATABASE_URL, ensure_directories
-from app.models import Base
+from app.models import Base, Job
+
 
+# Create async engines
+# SQLite allows one writer at a time, so writes share a single pooled
+# connection instead of queueing on the file lock from several.
+write_engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    future=True,
+    pool_size=1,
+    max_overflow=0,
+    pool_pre_ping=False,
+    pool_recycle=-1,
+    connect_args={'check_same_thread': False, 'timeout': 5},
+)
 
-# Create async engine
-engine = create_async_engine(
+# WAL lets readers run alongside the writer; keep a small warm pool so
+# polling requests reuse connections (and their page cache).
+# Autocommit skips the BEGIN/COMMIT pair per query.
+read_engine = create_async_engine(
     DATABASE_URL,
     echo=False,
     future=True,
+    pool_size=4,
+    max_overflow=4,
+    pool_pre_ping=False,
+    pool_recycle=-1,
+    connect_args={'check_same_thread': False, 'timeout': 5},
+    isolation_level='AUTOCOMMIT',
 )
 
 
-# Session factory
+# Session factory for writes
 async_session_factory = async_sessionmaker(
-    engine,
+    write_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+# Session factory for read-only endpoints
+read_session_factory = async_sessionmaker(
+    read_engine,
     class_=AsyncSession,
     expire_on_commit=False,
+    autoflush=False,
 )
 
 
+# Per-connection SQLite tuning, applied to every pooled connection
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-64000',  # 64 MB page cache
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA mmap_size=268435456',  # 256 MB memory-mapped I/O
+)
+
+
+@event.listens_for(write_engine.sync_engine, 'connect')
+@event.listens_for(read_engine.sync_engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS when the pool opens a new connection."""
+    # The aiosqlite adapter cursor has no executescript(), so issue them in turn
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
 async def enable_wal_mode():
-    """Enable WAL mode for SQLite concurrent read/write access."""
-    async with engine.begin() as conn:
+    """
+    Enable WAL mode for SQLite concurrent read/write access.
+
+    The connect listener already applies it; this forces the WAL file
+    to be created at startup.
+    """
+    async with write_engine.connect() as conn:
         await conn.execute(text('PRAGMA journal_mode=WAL'))
-        await conn.execute(text('PRAGMA synchronous=NORMAL'))
+
+
+def _create_missing_indexes(sync_conn):
+    """
+    Create indexes added after a table was first created.
+
+    create_all() skips existing tables entirely, including their indexes.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+def _migrate_jobs_table(sync_conn):
+    """
+    Rebuild the jobs table if it predates the created_at database-side
+    default or the status CHECK constraint.
+
+    SQLite cannot alter a column default or add a constraint, so the table
+    is copied into a freshly created one.
+    """
+    columns = sync_conn.execute(text('PRAGMA table_info(jobs)')).fetchall()
+    created_at = next((c for c in columns if c.name == 'created_at'), None)
+    if created_at is None:
+        return
+    table_sql = sync_conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'")
+    ).scalar()
+    if created_at.dflt_value is not None and 'ck_jobs_status' in table_sql:
+        return
+
+    names = ', '.join(c.name for c in columns)
+    sync_conn.execute(text('ALTER TABLE jobs RENAME TO jobs_old'))
+    for index in Job.__table__.indexes:
+        sync_conn.execute(text(f'DROP INDEX IF EXISTS {index.name}'))
+    Base.metadata.create_all(sync_conn)
+    sync_conn.execute(text(f'INSERT INTO jobs ({names}) SELECT {names} FROM jobs_old'))
+    sync_conn.execute(text('DROP TABLE jobs_old'))
+
+
+def _migrate_job_ids_to_blob(sync_conn):
+    """Convert job ids stored as UUID strings to 16-byte BLOBs."""
+    rows = sync_conn.execute(text("SELECT id FROM jobs WHERE typeof(id) = 'text'")).fetchall()
+    for (job_id,) in rows:
+        sync_conn.execute(
+            text('UPDATE jobs SET id = :new_id WHERE id = :old_id'),
+            {'new_id': uuid.UUID(job_id).bytes, 'old_id': job_id},
+        )
 
 
 async def init_db():
     """Initialize database - create tables if they don't exist."""
     ensure_directories()
 
-    async with engine.begin() as conn:
+    async with write_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_migrate_jobs_table)
+        await conn.run_sync(_create_missing_indexes)
+        await conn.run_sync(_migrate_job_ids_to_blob)
 
     # Enable WAL mode after tables are created
     await enable_wal_mode()
@@ -44,22 +154,41 @@ async def init_db():
 
 async def close_db():
     """Close database connections."""
-    await engine.dispose()
+    # Let SQLite refresh query planner statistics before the connections go away
+    async with write_engine.connect() as conn:
+        await conn.exec_driver_sql('PRAGMA optimize')
+    await write_engine.dispose()
+    await read_engine.dispose()
 
 
 async def get_db():
     """
-    Dependency that provides an async database session.
+    Dependency that provides an async database session for writes.
+
+    Endpoints must call commit() themselves; nothing is committed implicitly.
 
     Usage:
-        @app.get('/items')
-        async def get_items(db: AsyncSession = Depends(get_db)):
+        @app.post('/items')
+        async def create_item(db: AsyncSession = Depends(get_db)):
             ...
+            await db.commit()
     """
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db():
+    """
+    Dependency that provides an autocommit session for read-only endpoints.
+
+    Usage:
+        @app.get('/items')
+        async def get_items(db: AsyncSession = Depends(get_read_db)):
+            ...
+    """
+    async with read_session_factory() as session:
+        yield session
@@ -1,22 +1,107 @@
 """
 Job model for TTS generation tasks.
 """
+import os
+import threading
 import uuid
-import enum
-from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, Integer, Enum
+from sqlalchemy import CheckConstraint, Column, String, Text, DateTime, Integer, LargeBinary, text as sql_text
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
 
-class JobStatus(str, enum.Enum):
-    """Status states for TTS jobs."""
+class _UUIDPool:
+    """
+    Hands out random UUID4s carved from a shared urandom buffer.
+
+    One os.urandom() call covers 256 ids instead of one syscall per id.
+    Thread-safe, and the buffer is dropped in forked children so they
+    never repeat the parent's ids.
+    """
+
+    def __init__(self, buffer_size: int = 4096):
+        self._buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._buf = b''
+        self._pos = 0
+
+    def next(self) -> uuid.UUID:
+        with self._lock:
+            if self._pos + 16 > len(self._buf):
+                self._buf = os.urandom(self._buffer_size)
+                self._pos = 0
+            chunk = self._buf[self._pos:self._pos + 16]
+            self._pos += 16
+        # version=4 sets the version and variant bits like uuid.uuid4()
+        return uuid.UUID(bytes=chunk, version=4)
+
+    def _reset(self):
+        """Forget the buffer (and any lock held at fork time) in a child process."""
+        self._lock = threading.Lock()
+        self._buf = b''
+        self._pos = 0
+
+
+_uuid_pool = _UUIDPool()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_uuid_pool._reset)
+
+
+class _JobId(str):
+    """
+    A new job's id string that keeps the UUID's raw bytes.
+
+    The ORM attribute (and the sentinel matched against RETURNING rows)
+    must stay a plain-comparing string, but binding it can skip parsing.
+    """
+
+    def __new__(cls, value: uuid.UUID):
+        self = super().__new__(cls, str(value))
+        self.bytes = value.bytes
+        return self
+
+
+def _new_job_id() -> _JobId:
+    return _JobId(_uuid_pool.next())
+
+
+class UUIDBlob(TypeDecorator):
+    """
+    UUID stored as a 16-byte BLOB but exposed to Python as its string form.
+
+    Keeps the primary key index compact while the API keeps using string ids.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, (uuid.UUID, _JobId)):
+            return value.bytes
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            # A malformed id can never match a row - bind NULL so lookups miss
+            return None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=value))
+
+
+class JobStatus:
+    """Status states for TTS jobs - plain strings, validated by the database."""
     pending = 'pending'
     processing = 'processing'
     completed = 'completed'
     failed = 'failed'
 
+    all = (pending, processing, completed, failed)
+
 
 class Job(Base):
     """
@@ -36,16 +121,30 @@ class Job(Base):
     """
     __tablename__ = 'jobs'
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDBlob, primary_key=True, default=_new_job_id)
     text = Column(Text, nullable=False)
     voice_id = Column(String(100), nullable=True)
-    status = Column(String(20), nullable=False, default=JobStatus.pending.value)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    status = Column(String(20), nullable=False, default=JobStatus.pending)
+    # Filled in by SQLite (UTC, millisecond precision) and returned on insert
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=sql_text("(strftime('%Y-%m-%d %H:%M:%f', 'now'))"),
+        index=True,
+    )
     completed_at = Column(DateTime, nullable=True)
     audio_path = Column(Text, nullable=True)
     error_message = Column(Text, nullable=True)
     duration_ms = Column(Integer, nullable=True)
     file_size_bytes = Column(Integer, nullable=True)
 
+    __table_args__ = (
+        CheckConstraint(
+            'status IN ({})'.format(', '.join(f"'{s}'" for s in JobStatus.all)),
+            name='ck_jobs_status',
+        ),
+    )
+    __mapper_args__ = {'eager_defaults': True}
+
     def __repr__(self):
         return f'<Job {self.id} status={self.status}>'
@@ -3,14 +3,17 @@ Health check endpoint.
 """
 from typing import List
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Request
 
+from app.cache import TTLCache
 from app.config import APP_VERSION
-from app.services.tts_service import TTSService, get_tts_service
 
 
 router = APIRouter(tags=['health'])
 
+# The Swift app and web UI poll /health; serve repeats from memory briefly
+_health_cache = TTLCache(ttl=0.5)
+
 
 class HealthResponse(BaseModel):
     """Health check response schema."""
@@ -21,16 +24,17 @@ class HealthResponse(BaseModel):
 
 
 @router.get('/health', response_model=HealthResponse)
-async def health_check(tts: TTSService = Depends(get_tts_service)) -> HealthResponse:
+async def health_check(request: Request) -> HealthResponse:
     """
     Check server health status.
 
     Returns model status, available voices, and server version.
-    Fast response - no database queries.
+    Fast response - no database queries, cached for 500 ms.
     """
-    return HealthResponse(
+    tts = request.app.state.tts_service
+    return _health_cache.get(lambda: HealthResponse(
         status='ok',
         model_loaded=tts.is_loaded,
         available_voices=tts.get_voice_ids(),
         version=APP_VERSION,
-    )
+    ))
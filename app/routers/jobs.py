@@ -1,50 +1,108 @@
 """
 Job endpoints for TTS generation.
 """
+import asyncio
+import json
 import os
-from pathlib import Path
-from typing import Optional
+import uuid
+from typing import Iterable
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import FileResponse
-from sqlalchemy import select, func, delete
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import bindparam, delete, func, lambda_stmt, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db, read_session_factory
 from app.models.job import Job, JobStatus
 from app.schemas.job import JobCreate, JobResponse, JobListResponse
-from app.services.job_processor import get_job_processor
+from app.services.job_batcher import JobInsertBatcher, get_job_batcher
+from app.services.job_processor import JobProcessor, get_job_processor
 
 
 router = APIRouter(prefix='/jobs', tags=['jobs'])
 
+# Newest first; rowid breaks ties between jobs inserted in the same millisecond
+_NEWEST_FIRST = (Job.created_at.desc(), literal_column('rowid').desc())
+
+# Columns backing JobResponse - selected directly to skip ORM hydration
+_JOB_COLUMNS = (
+    Job.id,
+    Job.text,
+    Job.voice_id,
+    Job.status,
+    Job.created_at,
+    Job.completed_at,
+    Job.audio_path,
+    Job.error_message,
+    Job.duration_ms,
+    Job.file_size_bytes,
+)
+
+# Job lookup by id, compiled once and reused with a fresh 'job_id' parameter
+_JOB_BY_ID = lambda_stmt(lambda: select(Job).where(Job.id == bindparam('job_id')))
+
+# Status lookup by id for the events stream
+_STATUS_BY_ID = lambda_stmt(lambda: select(Job.status).where(Job.id == bindparam('job_id')))
+
+_FINISHED_STATUSES = (JobStatus.completed, JobStatus.failed)
+
+
+def _canonical_job_id(job_id: str) -> str:
+    """
+    Normalize a job id to its canonical lowercase form.
+
+    Lookups accept any form uuid.UUID() parses, but status events are keyed
+    by the canonical id, so handlers that wait or notify normalize first.
+
+    Raises:
+        404: Not a valid job id
+    """
+    try:
+        return str(uuid.UUID(job_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f'Job not found: {job_id}')
+
+
+def _unlink_many(paths: Iterable[str]):
+    """Delete files, ignoring ones that are already gone or can't be removed."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass  # Ignore file deletion errors
+
 
 @router.get('', response_model=JobListResponse)
 async def list_jobs(
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> JobListResponse:
     """
     List all TTS jobs with pagination.
 
     Returns jobs ordered by creation time (newest first).
     """
-    # Get total count
-    count_result = await db.execute(select(func.count(Job.id)))
-    total = count_result.scalar()
-
-    # Get paginated jobs
+    # Get paginated job rows with the total count attached to each row
     result = await db.execute(
-        select(Job)
-        .order_by(Job.created_at.desc())
+        select(*_JOB_COLUMNS, func.count().over().label('total'))
+        .order_by(*_NEWEST_FIRST)
         .limit(limit)
         .offset(offset)
     )
-    jobs = result.scalars().all()
+    rows = result.all()
+
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # Page past the end - no rows to carry the count
+        count_result = await db.execute(select(func.count(Job.id)))
+        total = count_result.scalar()
+    else:
+        total = 0
 
     return JobListResponse(
-        jobs=[JobResponse.model_validate(job) for job in jobs],
+        jobs=[JobResponse.model_validate(row) for row in rows],
         total=total,
         limit=limit,
         offset=offset,
@@ -55,26 +113,29 @@ async def list_jobs(
 async def create_job(
     job_data: JobCreate,
     db: AsyncSession = Depends(get_db),
+    batcher: JobInsertBatcher = Depends(get_job_batcher),
 ) -> JobResponse:
     """
     Create a new TTS generation job.
 
     Returns immediately with job ID and pending status.
     Job is processed asynchronously in the background.
+
+    Raises:
+        503: Job queue is full
     """
-    # Create job record
-    job = Job(
-        text=job_data.text,
-        voice_id=job_data.voice_id,
-        status=JobStatus.pending.value,
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(job)
+    # Create job record - concurrent creates share one transaction
+    job = await batcher.insert(job_data.text, job_data.voice_id)
 
     # Queue job for processing
     processor = get_job_processor()
-    await processor.enqueue(job.id)
+    try:
+        await processor.enqueue(job.id)
+    except asyncio.QueueFull:
+        # Never going to run - don't leave it pending in the history
+        await db.execute(delete(Job).where(Job.id == job.id))
+        await db.commit()
+        raise HTTPException(status_code=503, detail='Job queue is full, try again later')
 
     return JobResponse.model_validate(job)
 
@@ -82,14 +143,14 @@ async def create_job(
 @router.get('/{job_id}', response_model=JobResponse)
 async def get_job(
     job_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> JobResponse:
     """
     Get details for a specific job.
 
     Returns job status, timestamps, and audio path if completed.
     """
-    result = await db.execute(select(Job).where(Job.id == job_id))
+    result = await db.execute(_JOB_BY_ID, {'job_id': job_id})
     job = result.scalar_one_or_none()
 
     if not job:
@@ -98,10 +159,54 @@ async def get_job(
     return JobResponse.model_validate(job)
 
 
+async def _status_events(processor: JobProcessor, job_id: str):
+    """Yield an SSE message for the current status and each change after it."""
+    last_status = None
+    while True:
+        changed = processor.status_changed(job_id)
+        # Short-lived session per read - no pooled connection held while waiting
+        async with read_session_factory() as db:
+            status = await db.scalar(_STATUS_BY_ID, {'job_id': job_id})
+        if status is None:
+            return  # Deleted while we were watching
+        if status != last_status:
+            last_status = status
+            yield f'data: {json.dumps({"status": status})}\n\n'
+            if status in _FINISHED_STATUSES:
+                return
+        await changed.wait()
+
+
+@router.get('/{job_id}/events')
+async def stream_job_events(job_id: str) -> StreamingResponse:
+    """
+    Stream a job's status as Server-Sent Events.
+
+    Sends the current status on connect, then one event per change.
+    The stream ends once the job completes or fails.
+
+    Raises:
+        404: Job not found
+    """
+    job_id = _canonical_job_id(job_id)
+
+    # Not Depends(get_read_db) - that session would keep its pooled
+    # connection for as long as the stream stays open
+    async with read_session_factory() as db:
+        status = await db.scalar(_STATUS_BY_ID, {'job_id': job_id})
+    if status is None:
+        raise HTTPException(status_code=404, detail=f'Job not found: {job_id}')
+
+    return StreamingResponse(
+        _status_events(get_job_processor(), job_id),
+        media_type='text/event-stream',
+    )
+
+
 @router.get('/{job_id}/audio')
 async def get_job_audio(
     job_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Stream the audio file for a completed job.
@@ -111,30 +216,43 @@ async def get_job_audio(
     Raises:
         404: Job not found or audio not ready
     """
-    result = await db.execute(select(Job).where(Job.id == job_id))
+    result = await db.execute(_JOB_BY_ID, {'job_id': job_id})
     job = result.scalar_one_or_none()
 
     if not job:
         raise HTTPException(status_code=404, detail=f'Job not found: {job_id}')
 
-    if job.status != JobStatus.completed.value:
+    if job.status != JobStatus.completed:
         raise HTTPException(
             status_code=404,
             detail=f'Audio not ready. Job status: {job.status}'
         )
 
-    if not job.audio_path or not Path(job.audio_path).exists():
+    if not job.audio_path:
+        raise HTTPException(status_code=404, detail='Audio file not found')
+
+    # Stat once, off the event loop, and hand the result to FileResponse
+    try:
+        stat_result = await asyncio.to_thread(os.stat, job.audio_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail='Audio file not found')
 
     # Build descriptive filename
     voice_part = job.voice_id or 'default'
-    timestamp_part = job.created_at.strftime('%Y%m%d-%H%M%S') if job.created_at else 'audio'
+    dt = job.created_at
+    timestamp_part = (
+        f'{dt.year:04d}{dt.month:02d}{dt.day:02d}-{dt.hour:02d}{dt.minute:02d}{dt.second:02d}'
+        if dt else 'audio'
+    )
     filename = f'{voice_part}-{timestamp_part}.wav'
 
+    # Completed audio never changes, so let clients cache it indefinitely
     return FileResponse(
         path=job.audio_path,
         media_type='audio/wav',
         filename=filename,
+        stat_result=stat_result,
+        headers={'Cache-Control': 'public, max-age=31536000, immutable'},
     )
 
 
@@ -146,22 +264,23 @@ async def delete_job(
     """
     Delete a specific job and its associated audio file.
     """
-    result = await db.execute(select(Job).where(Job.id == job_id))
-    job = result.scalar_one_or_none()
+    job_id = _canonical_job_id(job_id)
 
-    if not job:
-        raise HTTPException(status_code=404, detail=f'Job not found: {job_id}')
+    # Delete the job record, collecting its audio path in the same statement
+    result = await db.execute(
+        delete(Job).where(Job.id == job_id).returning(Job.audio_path)
+    )
+    row = result.fetchone()
 
-    # Delete audio file if exists
-    if job.audio_path and Path(job.audio_path).exists():
-        try:
-            os.remove(job.audio_path)
-        except OSError:
-            pass  # Ignore file deletion errors
+    if row is None:
+        raise HTTPException(status_code=404, detail=f'Job not found: {job_id}')
 
-    # Delete job record
-    await db.delete(job)
     await db.commit()
+    get_job_processor().notify_status_changed(job_id)
+
+    # Delete audio file off the event loop
+    if row.audio_path:
+        await asyncio.to_thread(_unlink_many, [row.audio_path])
 
 
 @router.delete('', status_code=204)
@@ -171,18 +290,16 @@ async def delete_all_jobs(db: AsyncSession = Depends(get_db)):
 
     Used for clearing history.
     """
-    # Get all jobs with audio paths
-    result = await db.execute(select(Job.audio_path).where(Job.audio_path.isnot(None)))
-    audio_paths = [row[0] for row in result.fetchall()]
+    # Delete all job records, collecting audio paths in the same statement
+    result = await db.execute(delete(Job).returning(Job.id, Job.audio_path))
+    rows = result.fetchall()
+    await db.commit()
 
-    # Delete audio files
-    for audio_path in audio_paths:
-        if audio_path and Path(audio_path).exists():
-            try:
-                os.remove(audio_path)
-            except OSError:
-                pass  # Ignore file deletion errors
+    # Let open event streams see the jobs are gone
+    processor = get_job_processor()
+    for row in rows:
+        processor.notify_status_changed(row.id)
+    audio_paths = [row.audio_path for row in rows if row.audio_path]
 
-    # Delete all job records
-    await db.execute(delete(Job))
-    await db.commit()
+    # Delete audio files in one batch off the event loop
+    await asyncio.to_thread(_unlink_many, audio_paths)
@@ -5,16 +5,21 @@ Task 3.4: Backend endpoints for model download with progress tracking.
 The Chatterbox model is downloaded via HuggingFace/transformers library.
 """
 import asyncio
-import threading
+import json
 from typing import Optional
 from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
+from app.cache import TTLCache
 from app.services.tts_service import get_tts_service
 
 
 router = APIRouter(prefix='/model', tags=['model'])
 
+# Cached /model/status response for polling clients
+_status_cache = TTLCache(ttl=0.5)
+
 
 class ModelDownloadProgress(BaseModel):
     """Progress information for model download."""
@@ -31,16 +36,21 @@ class ModelDownloadResponse(BaseModel):
     message: str
 
 
-# Global state for tracking download progress
+# Global state for tracking download progress.
+# Writers swap in a new dict instead of mutating it, so readers can take the
+# current reference without a lock (name rebinding is atomic under the GIL).
 _download_state = {
     'status': 'idle',
     'progress': 0.0,
     'downloaded_bytes': 0,
     'total_bytes': 0,
     'message': '',
-    'lock': threading.Lock(),
 }
 
+# (event loop, event) pairs for open /model/progress/stream connections.
+# Updates arrive from the download thread, so events are set thread-safely.
+_subscribers = set()
+
 
 def _update_download_state(
     status: Optional[str] = None,
@@ -49,35 +59,34 @@ def _update_download_state(
     total_bytes: Optional[int] = None,
     message: Optional[str] = None,
 ):
-    """Thread-safe update of download state."""
-    with _download_state['lock']:
-        if status is not None:
-            _download_state['status'] = status
-        if progress is not None:
-            _download_state['progress'] = progress
-        if downloaded_bytes is not None:
-            _download_state['downloaded_bytes'] = downloaded_bytes
-        if total_bytes is not None:
-            _download_state['total_bytes'] = total_bytes
-        if message is not None:
-            _download_state['message'] = message
+    """Publish a new download state snapshot."""
+    global _download_state
+    changes = {
+        'status': status,
+        'progress': progress,
+        'downloaded_bytes': downloaded_bytes,
+        'total_bytes': total_bytes,
+        'message': message,
+    }
+    _download_state = {
+        **_download_state,
+        **{key: value for key, value in changes.items() if value is not None},
+    }
+    for loop, event in list(_subscribers):
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            _subscribers.discard((loop, event))  # Loop already closed
 
 
 def _get_download_state() -> dict:
-    """Thread-safe read of download state."""
-    with _download_state['lock']:
-        return {
-            'status': _download_state['status'],
-            'progress': _download_state['progress'],
-            'downloaded_bytes': _download_state['downloaded_bytes'],
-            'total_bytes': _download_state['total_bytes'],
-            'message': _download_state['message'],
-        }
+    """Return the current download state snapshot (treat as read-only)."""
+    return _download_state
 
 
 def _download_model_sync():
     """
-    Synchronous model download function to run in background thread.
+    Synchronous model download function to run in the executor.
 
     This calls the TTS service load_model() which triggers HuggingFace
     to download the Chatterbox model if not already cached.
@@ -96,7 +105,7 @@ def _download_model_sync():
             _update_download_state(
                 status='completed',
                 progress=1.0,
-                downloaded_bytes=_download_state['total_bytes'],
+                downloaded_bytes=_get_download_state()['total_bytes'],
                 message='Model already loaded',
             )
             return
@@ -146,14 +155,44 @@ async def get_download_progress() -> ModelDownloadProgress:
     )
 
 
+async def _progress_events():
+    """Yield an SSE message for the current state and each change after it."""
+    subscriber = (asyncio.get_running_loop(), asyncio.Event())
+    _subscribers.add(subscriber)
+    try:
+        last_state = None
+        while True:
+            state = _get_download_state()
+            if state is not last_state:
+                last_state = state
+                yield f'data: {json.dumps(state)}\n\n'
+                if state['status'] in ('completed', 'error'):
+                    return
+            await subscriber[1].wait()
+            subscriber[1].clear()
+    finally:
+        _subscribers.discard(subscriber)
+
+
+@router.get('/progress/stream')
+async def stream_download_progress() -> StreamingResponse:
+    """
+    Stream model download progress as Server-Sent Events.
+
+    Sends the current state on connect, then one event per state change.
+    The stream ends once the download completes or fails.
+    """
+    return StreamingResponse(_progress_events(), media_type='text/event-stream')
+
+
 @router.post('/download', response_model=ModelDownloadResponse)
 async def trigger_model_download() -> ModelDownloadResponse:
     """
     Trigger model download.
 
-    Starts the model download in a background thread.
+    Starts the model download in the default thread pool executor.
     Returns immediately while download proceeds asynchronously.
-    Use /model/progress to poll for progress updates.
+    Use /model/progress or /model/progress/stream to follow progress.
     """
     tts_service = get_tts_service()
 
@@ -184,10 +223,9 @@ async def trigger_model_download() -> ModelDownloadResponse:
         message='Starting download...',
     )
 
-    # Start download in background thread
-    # We use a thread because model loading is CPU-bound and blocking
-    download_thread = threading.Thread(target=_download_model_sync, daemon=True)
-    download_thread.start()
+    # Run the download in the default executor - model loading is blocking.
+    # _download_model_sync reports its own errors through the download state.
+    asyncio.get_running_loop().run_in_executor(None, _download_model_sync)
 
     return ModelDownloadResponse(
         status='started',
@@ -196,14 +234,15 @@ async def trigger_model_download() -> ModelDownloadResponse:
 
 
 @router.get('/status')
-async def get_model_status() -> dict:
+async def get_model_status(request: Request) -> dict:
     """
     Get current model status.
 
     Returns whether the model is loaded and ready for use.
+    Cached for 500 ms.
     """
-    tts_service = get_tts_service()
-    return {
+    tts_service = request.app.state.tts_service
+    return _status_cache.get(lambda: {
         'loaded': tts_service.is_loaded,
         'voices': tts_service.get_voice_ids() if tts_service.is_loaded else [],
-    }
+    })
@@ -1,44 +1,52 @@
 """
 Voice endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 
-from app.services.tts_service import TTSService, get_tts_service
 from app.schemas.voice import VoiceResponse, VoiceListResponse
 
 
 router = APIRouter(prefix='/voices', tags=['voices'])
 
+# Serialized /voices body as (service, voices_version, JSON bytes)
+_voices_body = (None, -1, b'')
+
 
 @router.get('', response_model=VoiceListResponse)
-async def list_voices(tts: TTSService = Depends(get_tts_service)) -> VoiceListResponse:
+async def list_voices(request: Request) -> Response:
     """
     List all available voices.
 
-    Rescans the voices directory on each request to detect newly added voice files.
+    The voice list is kept current by a directory watcher started with the
+    server, so this is an in-memory read. The JSON body is built once per
+    voice list change and reused until the next one.
     Returns voice IDs and display names.
     """
-    # Rescan voices directory on each request for on-demand refresh
-    tts.scan_voices()
-    voices = tts.get_voices()
-    return VoiceListResponse(
-        voices=[
-            VoiceResponse(
-                id=v.id,
-                display_name=v.display_name,
-                file_path=v.file_path,
-                duration=v.duration,
-            )
-            for v in voices
-        ]
-    )
+    global _voices_body
+    tts = request.app.state.tts_service
+    version = tts.voices_version
+
+    service, cached_version, body = _voices_body
+    if service is not tts or cached_version != version:
+        body = VoiceListResponse(
+            voices=[
+                VoiceResponse(
+                    id=v.id,
+                    display_name=v.display_name,
+                    file_path=v.file_path,
+                    duration=v.duration,
+                )
+                for v in tts.get_voices()
+            ]
+        ).model_dump_json().encode()
+        _voices_body = (tts, version, body)
+
+    return Response(content=body, media_type='application/json')
 
 
 @router.get('/{voice_id}', response_model=VoiceResponse)
-async def get_voice(
-    voice_id: str,
-    tts: TTSService = Depends(get_tts_service)
-) -> VoiceResponse:
+async def get_voice(voice_id: str, request: Request) -> JSONResponse:
     """
     Get details for a specific voice.
 
@@ -51,13 +59,15 @@ async def get_voice(
     Raises:
         404: Voice not found
     """
-    voice = tts.get_voice(voice_id)
+    voice = request.app.state.tts_service.get_voice(voice_id)
     if not voice:
         raise HTTPException(status_code=404, detail=f'Voice not found: {voice_id}')
 
-    return VoiceResponse(
-        id=voice.id,
-        display_name=voice.display_name,
-        file_path=voice.file_path,
-        duration=voice.duration,
-    )
+    # Returning a response directly skips response_model validation;
+    # the model still documents the shape in the OpenAPI schema
+    return JSONResponse({
+        'id': voice.id,
+        'display_name': voice.display_name,
+        'file_path': voice.file_path,
+        'duration': voice.duration,
+    })
@@ -0,0 +1,87 @@
+"""
+Coalesces job inserts into shared transactions.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import async_session_factory
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class JobInsertBatcher:
+    """
+    Inserts new jobs in batches, one transaction (and one WAL sync) per batch.
+
+    The first caller to find no flush in progress schedules one; every insert
+    that arrives before it runs - or while a previous batch is committing -
+    joins the next batch. Each caller still awaits its own job.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = async_session_factory, max_batch: int = 64):
+        self._session_factory = session_factory
+        self._max_batch = max_batch
+        self._pending: List[Tuple[Job, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def insert(self, text: str, voice_id: Optional[str] = None) -> Job:
+        """Insert a pending job and return it once its batch has committed."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((
+            Job(text=text, voice_id=voice_id, status=JobStatus.pending),
+            future,
+        ))
+
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+
+        return await future
+
+    async def _flush(self):
+        """Commit pending jobs in batches until none are left."""
+        try:
+            while self._pending:
+                batch = self._pending[:self._max_batch]
+                del self._pending[:self._max_batch]
+
+                try:
+                    async with self._session_factory() as session:
+                        session.add_all([job for job, _ in batch])
+                        await session.commit()
+                except Exception as e:
+                    logger.exception('Failed to insert a batch of %d jobs', len(batch))
+                    # One exception per caller, so their tracebacks don't pile up on a shared one
+                    for _, future in batch:
+                        if not future.done():
+                            error = RuntimeError('job insert failed')
+                            error.__cause__ = e
+                            future.set_exception(error)
+                else:
+                    for job, future in batch:
+                        if not future.done():
+                            future.set_result(job)
+        finally:
+            self._flush_task = None
+
+
+# Singleton instance
+_job_batcher: Optional[JobInsertBatcher] = None
+
+
+def get_job_batcher() -> JobInsertBatcher:
+    """Get the job insert batcher singleton instance."""
+    global _job_batcher
+    if _job_batcher is None:
+        _job_batcher = JobInsertBatcher()
+    return _job_batcher
+
+
+def reset_job_batcher():
+    """Reset the job insert batcher singleton (for testing)."""
+    global _job_batcher
+    _job_batcher = None
@@ -4,14 +4,15 @@ Background job processor for TTS generation.
 import asyncio
 import logging
 import time
-from datetime import datetime
+import weakref
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import AUDIO_DIR
+from app.config import AUDIO_DIR, JOB_QUEUE_MAX
 from app.models.job import Job, JobStatus
 from app.database import async_session_factory
 from app.services.tts_service import get_tts_service
@@ -27,9 +28,11 @@ class JobProcessor:
     """
 
     def __init__(self):
-        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=JOB_QUEUE_MAX)
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        # One event per watched job, dropped once nobody is waiting on it
+        self._status_events: weakref.WeakValueDictionary[str, asyncio.Event] = weakref.WeakValueDictionary()
 
     async def start(self):
         """Start the background job processor."""
@@ -40,8 +43,12 @@ class JobProcessor:
         """Stop the background job processor gracefully."""
         self._running = False
         if self._task:
-            # Put a sentinel to wake up the queue if waiting
-            await self._queue.put('')
+            # Put a sentinel to wake up the queue if waiting (a full queue
+            # is already awake and sees _running within a second)
+            try:
+                self._queue.put_nowait('')
+            except asyncio.QueueFull:
+                pass
             try:
                 await asyncio.wait_for(self._task, timeout=5.0)
             except asyncio.TimeoutError:
@@ -52,87 +59,120 @@ class JobProcessor:
                     pass
 
     async def enqueue(self, job_id: str):
-        """Add a job ID to the processing queue."""
-        await self._queue.put(job_id)
+        """
+        Add a job ID to the processing queue.
+
+        Raises:
+            asyncio.QueueFull: JOB_QUEUE_MAX jobs are already waiting
+        """
+        self._queue.put_nowait(job_id)
+
+    def status_changed(self, job_id: str) -> asyncio.Event:
+        """
+        Get an event that is set the next time the job's status changes.
+
+        Take the event before reading the status, so a change that lands in
+        between still wakes the caller.
+        """
+        event = self._status_events.get(job_id)
+        if event is None:
+            event = asyncio.Event()
+            self._status_events[job_id] = event
+        return event
+
+    def notify_status_changed(self, job_id: str):
+        """Wake everyone waiting on the job; later waiters get a fresh event."""
+        event = self._status_events.pop(job_id, None)
+        if event is not None:
+            event.set()
 
     async def _process_loop(self):
-        """Main processing loop - consumes jobs from queue."""
-        while self._running:
-            try:
+        """
+        Main processing loop - consumes jobs from queue.
+
+        Jobs run strictly one at a time, so a single session is reused for
+        all of them and cleared between jobs.
+        """
+        async with async_session_factory() as session:
+            while self._running:
                 # Wait for a job with timeout to allow checking _running flag
                 try:
                     job_id = await asyncio.wait_for(self._queue.get(), timeout=1.0)
                 except asyncio.TimeoutError:
                     continue
 
-                # Check for sentinel value
-                if not job_id:
-                    continue
-
-                await self._process_job(job_id)
-                self._queue.task_done()
+                try:
+                    # Check for sentinel value
+                    if not job_id:
+                        continue
+
+                    await self._process_job(session, job_id)
+
+                except Exception:
+                    # Log but don't crash the loop
+                    logger.exception('Error in job processor loop')
+                    await session.rollback()
+
+                finally:
+                    # Once per get(), so join() returns even after a failed job
+                    self._queue.task_done()
+                    # Don't carry finished jobs over in the identity map
+                    session.expunge_all()
+
+    async def _process_job(self, session: AsyncSession, job_id: str):
+        """Process a single job using the loop's session."""
+        # Claim the job: flip pending -> processing and load it in one statement
+        result = await session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.pending)
+            .values(status=JobStatus.processing)
+            .returning(Job)
+        )
+        job = result.scalar_one_or_none()
+        await session.commit()
+
+        if not job:
+            logger.warning('Job %s not found or not pending', job_id)
+            return
+        self.notify_status_changed(job_id)
+
+        # Process the job
+        start_ns = time.perf_counter_ns()
+        try:
+            tts_service = get_tts_service()
+
+            # Generate audio
+            output_path = AUDIO_DIR / f'{job_id}.wav'
+            file_size = await tts_service.generate_to_file(
+                text=job.text,
+                output_path=output_path,
+                voice_id=job.voice_id,
+            )
 
-            except Exception as e:
-                # Log but don't crash the loop
-                logger.exception('Error in job processor loop')
+            # Calculate duration
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-    async def _process_job(self, job_id: str):
-        """Process a single job."""
-        async with async_session_factory() as session:
-            # Fetch the job
-            result = await session.execute(
-                select(Job).where(Job.id == job_id)
-            )
-            job = result.scalar_one_or_none()
+            # Update job with success
+            job.status = JobStatus.completed
+            job.completed_at = datetime.now(timezone.utc)
+            job.audio_path = str(output_path)
+            job.duration_ms = duration_ms
+            job.file_size_bytes = file_size
 
-            if not job:
-                logger.warning('Job %s not found', job_id)
-                return
+        except Exception as e:
+            # Calculate duration even for failures
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-            if job.status != JobStatus.pending.value:
-                logger.warning('Job %s is not pending (status: %s)', job_id, job.status)
-                return
+            # Update job with failure
+            job.status = JobStatus.failed
+            job.completed_at = datetime.now(timezone.utc)
+            job.error_message = str(e)
+            job.duration_ms = duration_ms
 
-            # Update status to processing
-            job.status = JobStatus.processing.value
-            await session.commit()
+            logger.error('Job %s failed: %s', job_id, e)
 
-            # Process the job
-            start_time = time.time()
-            try:
-                tts_service = get_tts_service()
-
-                # Generate audio
-                output_path = AUDIO_DIR / f'{job_id}.wav'
-                file_size = await tts_service.generate_to_file(
-                    text=job.text,
-                    output_path=output_path,
-                    voice_id=job.voice_id,
-                )
-
-                # Calculate duration
-                duration_ms = int((time.time() - start_time) * 1000)
-
-                # Update job with success
-                job.status = JobStatus.completed.value
-                job.completed_at = datetime.utcnow()
-                job.audio_path = str(output_path)
-                job.duration_ms = duration_ms
-                job.file_size_bytes = file_size
-
-            except Exception as e:
-                # Calculate duration even for failures
-                duration_ms = int((time.time() - start_time) * 1000)
-
-                # Update job with failure
-                job.status = JobStatus.failed.value
-                job.completed_at = datetime.utcnow()
-                job.error_message = str(e)
-                job.duration_ms = duration_ms
-
-                logger.error('Job %s failed: %s', job_id, e)
-
-            await session.commit()
+        await session.commit()
+        self.notify_status_changed(job_id)
 
 
 # Singleton instance
@@ -2,21 +2,30 @@
 TTS Service encapsulating Chatterbox TurboTTS model state.
 """
 import asyncio
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, List
-from concurrent.futures import ThreadPoolExecutor
-import functools
+from typing import Callable, Dict, Optional, List, Tuple
 
-from app.config import VOICES_DIR, MODEL_DEVICE, AUDIO_DIR, MODEL_AGGRESSIVE_MEMORY
+from watchfiles import awatch
 
+from app.config import (
+    VOICES_DIR, MODEL_DEVICE, AUDIO_DIR, MODEL_AGGRESSIVE_MEMORY, MODEL_PRECISION, TORCH_COMPILE,
+)
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
 class Voice:
     """Represents an available voice for TTS."""
-    def __init__(self, id: str, display_name: str, file_path: str, duration: Optional[float] = None):
-        self.id = id
-        self.display_name = display_name
-        self.file_path = file_path
-        self.duration = duration
+    id: str
+    display_name: str
+    file_path: str
+    duration: Optional[float] = None
 
 
 class TTSService:
@@ -24,22 +33,38 @@ class TTSService:
     Encapsulates TTS model state and generation logic.
 
     Provides async-safe methods for TTS generation using Chatterbox TurboTTS.
-    Uses asyncio.Lock to prevent concurrent model access (model is not thread-safe).
+    All model work runs on one persistent worker thread fed by a queue, so
+    requests are serialized (model is not thread-safe) without a lock.
     """
 
     def __init__(self):
         self.model = None
         self.default_conds = None
         self._voices: Dict[str, Voice] = {}
-        self._lock = asyncio.Lock()
-        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._voice_ids: Tuple[str, ...] = ()
+        # Directory and mtime the cached voices were scanned from
+        self._voices_dir_cached: Optional[Path] = None
+        self._voices_mtime_ns: int = -1
+        self._voices_version = 0
         self._loaded = False
+        # torch module and per-generation branch flags, bound once by load_model()
+        self._torch = None
+        self._mps_available = False
+        self._should_empty_cache = False
+        # Inference worker, started on first use
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
 
     @property
     def is_loaded(self) -> bool:
         """Check if the model is loaded."""
         return self._loaded and self.model is not None
 
+    @property
+    def voices_version(self) -> int:
+        """Counter bumped each time the voice list is rebuilt."""
+        return self._voices_version
+
     def load_model(self):
         """
         Load the Chatterbox TurboTTS model.
@@ -52,8 +77,45 @@ class TTSService:
 
         self.model = ChatterboxTurboTTS.from_pretrained(device=MODEL_DEVICE)
         self.default_conds = self.model.conds
+        if MODEL_PRECISION in ('fp16', 'bf16'):
+            self._autocast_t3(torch, torch.float16 if MODEL_PRECISION == 'fp16' else torch.bfloat16)
+        if TORCH_COMPILE:
+            self._compile_model(torch)
+        self._torch = torch
+        self._mps_available = torch.backends.mps.is_available()
+        self._should_empty_cache = bool(MODEL_AGGRESSIVE_MEMORY and self._mps_available)
         self._loaded = True
 
+    def _autocast_t3(self, torch, dtype):
+        """
+        Run speech-token generation under autocast at the given precision.
+
+        Only the T3 language model is wrapped: it dominates generation time
+        and returns integer tokens, so the vocoder and watermarker still see
+        float32 audio.
+        """
+        inference_turbo = self.model.t3.inference_turbo
+        device_type = str(self.model.device).split(':')[0]
+
+        def inference_turbo_autocast(*args, **kwargs):
+            with torch.autocast(device_type=device_type, dtype=dtype):
+                return inference_turbo(*args, **kwargs)
+
+        self.model.t3.inference_turbo = inference_turbo_autocast
+
+    def _compile_model(self, torch):
+        """
+        Wrap the T3 transformer backbone in torch.compile.
+
+        It runs once per generated speech token, so it's where compilation
+        pays off. Backend support varies (notably on MPS), so failures leave
+        the eager model in place.
+        """
+        try:
+            self.model.t3.tfmr = torch.compile(self.model.t3.tfmr, dynamic=True)
+        except Exception as e:
+            logger.warning('torch.compile unavailable, using eager model: %s', e)
+
     def scan_voices(self) -> Dict[str, Voice]:
         """
         Scan voices directory for available voice files.
@@ -61,23 +123,61 @@ class TTSService:
         Uses exact filename stem as both id and display_name:
             C3-PO.wav -> id=C3-PO, display_name=C3-PO
             Jerry_Seinfeld.wav -> id=Jerry_Seinfeld, display_name=Jerry_Seinfeld
+
+        The result is cached until the directory's mtime changes, which
+        happens whenever a file is added, removed or renamed.
         """
-        self._voices = {}
+        try:
+            mtime_ns = VOICES_DIR.stat().st_mtime_ns
+        except FileNotFoundError:
+            if self._voices:
+                self._voices = {}
+                self._voice_ids = ()
+                self._voices_version += 1
+            self._voices_dir_cached = None
+            self._voices_mtime_ns = -1
+            return self._voices
+
+        if VOICES_DIR == self._voices_dir_cached and mtime_ns == self._voices_mtime_ns:
+            return self._voices
+
+        voices = {}
+        with os.scandir(VOICES_DIR) as entries:
+            for entry in entries:
+                # DirEntry caches the file type, so is_file() only stats symlinks
+                if not entry.name.endswith('.wav') or not entry.is_file():
+                    continue
 
-        if VOICES_DIR.exists():
-            for f in VOICES_DIR.glob('*.wav'):
                 # Use exact filename stem for both id and display name
-                stem = f.stem
+                stem = entry.name[:-4]
 
-                self._voices[stem] = Voice(
+                voices[stem] = Voice(
                     id=stem,
                     display_name=stem,
-                    file_path=str(f),
+                    file_path=entry.path,
                     duration=None,  # Could be populated by analyzing audio file
                 )
 
+        self._voices = voices
+        self._voice_ids = tuple(voices)
+        self._voices_version += 1
+        self._voices_dir_cached = VOICES_DIR
+        self._voices_mtime_ns = mtime_ns
         return self._voices
 
+    async def watch_voices(self):
+        """
+        Keep the voice list in sync with the voices directory.
+
+        Scans once, then rescans whenever the directory changes.
+        Runs until cancelled.
+        """
+        self.scan_voices()
+        async for _changes in awatch(VOICES_DIR):
+            # Coarse mtimes (HFS+, FAT, network mounts) may not have moved yet
+            self._voices_mtime_ns = -1
+            self.scan_voices()
+
     def get_voices(self) -> List[Voice]:
         """Get list of all available voices."""
         return list(self._voices.values())
@@ -86,17 +186,17 @@ class TTSService:
         """Get a specific voice by ID."""
         return self._voices.get(voice_id)
 
-    def get_voice_ids(self) -> List[str]:
-        """Get list of all voice IDs."""
-        return list(self._voices.keys())
+    def get_voice_ids(self) -> Tuple[str, ...]:
+        """Get all voice IDs (cached per scan, so no copy is made)."""
+        return self._voice_ids
 
     def _generate_sync(self, text: str, voice_path: Optional[str] = None) -> tuple:
         """
-        Synchronous generation method to run in executor.
+        Synchronous generation method, run on the inference worker thread.
 
-        Returns tuple of (wav_tensor, sample_rate).
+        Returns tuple of (wav_tensor, sample_rate); the tensor is int16 PCM.
         """
-        import torch
+        torch = self._torch
 
         with torch.inference_mode():
             if voice_path:
@@ -108,50 +208,112 @@ class TTSService:
 
             # Synchronize MPS to ensure GPU operations complete before returning
             # This prevents Metal assertion failures when tensors are freed
-            if torch.backends.mps.is_available():
+            if self._mps_available:
                 torch.mps.synchronize()
 
-        # Move result to CPU and free GPU memory
-        wav_cpu = wav.cpu()
+        # Quantize to int16 PCM for the file writer, rounding to the nearest
+        # step (a bare cast truncates toward zero), then free GPU memory
+        wav_cpu = (wav.clamp(-1.0, 1.0) * 32767.0).round().to(torch.int16).cpu()
         del wav
 
-        if MODEL_AGGRESSIVE_MEMORY and torch.backends.mps.is_available():
+        if self._should_empty_cache:
             torch.mps.empty_cache()
 
         return wav_cpu, self.model.sr
 
+    def _worker_loop(self):
+        """Run queued model calls one at a time until a None sentinel arrives."""
+        while True:
+            item = self._requests.get()
+            if item is None:
+                break
+
+            loop, future, func, args = item
+            result, error = None, None
+            try:
+                result = func(*args)
+            except Exception as e:
+                error = e
+
+            try:
+                loop.call_soon_threadsafe(_resolve_future, future, result, error)
+            except RuntimeError:
+                pass  # Caller's event loop already closed
+
+    async def _submit(self, func: Callable, *args):
+        """Run func(*args) on the inference worker thread and await its result."""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._worker_loop, name='tts-inference', daemon=True
+            )
+            self._worker.start()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.put((loop, future, func, args))
+        return await future
+
+    async def warmup(self):
+        """
+        Run a throwaway generation so device and kernel setup happen now.
+
+        torch.compile only fails on first use, so a compiled model that can't
+        generate is swapped back to eager here rather than failing every job.
+        """
+        try:
+            await self.generate('warmup')
+        except Exception as e:
+            eager = getattr(self.model.t3.tfmr, '_orig_mod', None) if TORCH_COMPILE else None
+            if eager is None:
+                raise
+            logger.warning('Compiled model failed during warm-up, using eager model: %s', e)
+            self.model.t3.tfmr = eager
+            await self.generate('warmup')
+
+    def _generate_to_file_sync(self, text: str, output_path: Path, voice_path: Optional[str]) -> int:
+        """Generate audio and save it to output_path; returns the file size."""
+        import soundfile as sf
+
+        wav, sr = self._generate_sync(text, voice_path)
+
+        # Ensure output directory exists
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write the (1, samples) int16 tensor straight through libsndfile
+        samples = wav.squeeze(0).contiguous().numpy()
+        sf.write(str(output_path), samples, sr, subtype='PCM_16')
+
+        return output_path.stat().st_size
+
+    def _voice_path(self, voice_id: Optional[str]) -> Optional[str]:
+        """Resolve a voice ID to its prompt file (None = default voice)."""
+        if voice_id:
+            voice = self.get_voice(voice_id)
+            if voice:
+                return voice.file_path
+        return None
+
     async def generate(self, text: str, voice_id: Optional[str] = None) -> tuple:
         """
         Generate TTS audio asynchronously.
 
-        Uses asyncio.Lock to ensure exclusive model access.
-        Runs actual generation in thread pool to avoid blocking event loop.
+        Runs on the inference worker thread to avoid blocking the event loop.
 
         Args:
             text: Text to synthesize
             voice_id: Voice ID (None = default voice)
 
         Returns:
-            Tuple of (wav_tensor, sample_rate)
+            Tuple of (int16 wav_tensor, sample_rate)
         """
-        voice_path = None
-        if voice_id:
-            voice = self.get_voice(voice_id)
-            if voice:
-                voice_path = voice.file_path
-
-        async with self._lock:
-            loop = asyncio.get_event_loop()
-            wav, sr = await loop.run_in_executor(
-                self._executor,
-                functools.partial(self._generate_sync, text, voice_path)
-            )
-            return wav, sr
+        return await self._submit(self._generate_sync, text, self._voice_path(voice_id))
 
     async def generate_to_file(self, text: str, output_path: Path, voice_id: Optional[str] = None) -> int:
         """
         Generate TTS audio and save to file.
 
+        Generation and saving both run on the inference worker thread.
+
         Args:
             text: Text to synthesize
             output_path: Path to save the audio file
@@ -160,26 +322,30 @@ class TTSService:
         Returns:
             File size in bytes
         """
-        import torchaudio as ta
-
-        wav, sr = await self.generate(text, voice_id)
-
-        # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Save audio file
-        ta.save(str(output_path), wav, sr)
-
-        return output_path.stat().st_size
+        return await self._submit(
+            self._generate_to_file_sync, text, output_path, self._voice_path(voice_id)
+        )
 
     def cleanup(self):
         """Clean up resources."""
-        self._executor.shutdown(wait=False)
+        if self._worker is not None:
+            self._requests.put(None)
+            self._worker = None
         self.model = None
         self.default_conds = None
         self._loaded = False
 
 
+def _resolve_future(future: asyncio.Future, result, error: Optional[BaseException]):
+    """Complete a worker future on its event loop, unless the caller gave up on it."""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
 # Singleton instance
 _tts_service: Optional[TTSService] = None
 
@@ -188,10 +354,10 @@ def get_tts_service() -> TTSService:
     """
     Get the TTS service singleton instance.
 
-    Usage with FastAPI dependency injection:
+    The server stores it on app.state at startup, so routers read it with:
         @app.get('/voices')
-        async def get_voices(tts: TTSService = Depends(get_tts_service)):
-            return tts.get_voices()
+        async def get_voices(request: Request):
+            return request.app.state.tts_service.get_voices()
     """
     global _tts_service
     if _tts_service is None:
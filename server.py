@@ -6,8 +6,10 @@ A job-based TTS generation server using Chatterbox TurboTTS.
 Provides async API endpoints for voice listing, job management, and audio retrieval.
 """
 # CRITICAL: Must be first for PyInstaller multiprocessing support
+# Only the frozen build needs it; dev runs keep the platform default
 import multiprocessing
-if __name__ == '__main__':
+import sys
+if __name__ == '__main__' and getattr(sys, 'frozen', False):
     multiprocessing.freeze_support()
     multiprocessing.set_start_method('spawn', force=True)
 
@@ -25,19 +27,35 @@ os.environ['TOKENIZERS_PARALLELISM'] = 'false'
 import perth
 perth.PerthImplicitWatermarker = perth.DummyWatermarker
 
+import asyncio
+import hashlib
+import logging
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request, Response
 from starlette.staticfiles import StaticFiles
 
-from app.config import APP_NAME, APP_VERSION, SERVER_HOST, SERVER_PORT, STATIC_DIR, TEMPLATES_DIR
+from app.config import (
+    APP_NAME, APP_VERSION, LOG_LEVEL, MODEL_WARMUP, SERVER_HOST, SERVER_PORT, STATIC_DIR,
+    TEMPLATES_DIR, TORCH_COMPILE,
+)
 from app.database import init_db, close_db
 from app.services.tts_service import get_tts_service
 from app.services.job_processor import get_job_processor
 from app.routers import health_router, voices_router, jobs_router, model_router
 
+logger = logging.getLogger('talky')
+
+
+def _log_watcher_failure(task: asyncio.Task):
+    """Report a voices watcher that died instead of being cancelled."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            'Voices watcher stopped; voice changes need a restart to show up',
+            exc_info=task.exception(),
+        )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -47,54 +65,79 @@ async def lifespan(app: FastAPI):
     Startup:
         - Initialize database and create tables
         - Load TTS model (if available/cached)
-        - Scan available voices
+        - Warm up the model (if MODEL_WARMUP=1 or TALKY_TORCH_COMPILE=1)
+        - Scan available voices and watch the voices directory
         - Start job processor
 
     Shutdown:
+        - Stop voices watcher
         - Stop job processor
         - Clean up model resources
         - Close database connections
     """
-    print(f'Starting {APP_NAME} v{APP_VERSION}...')
+    logger.info('Starting %s v%s...', APP_NAME, APP_VERSION)
 
     # Initialize database
-    print('Initializing database...')
+    logger.info('Initializing database...')
     await init_db()
 
     # Try to load TTS model (will succeed if model is already cached)
     # Task 3.2: If model not cached, health endpoint will show model_loaded=false
-    print('Checking for TTS model...')
+    logger.info('Checking for TTS model...')
     tts_service = get_tts_service()
+    # Routers read the singleton from app.state instead of a per-request dependency
+    app.state.tts_service = tts_service
 
     try:
         tts_service.load_model()
-        print('Model loaded!')
+        logger.info('Model loaded!')
 
         # Scan voices
         voices = tts_service.scan_voices()
         if voices:
-            print(f'Available voices: {", ".join(voices.keys())}')
+            logger.info('Available voices: %s', ', '.join(voices.keys()))
         else:
-            print('No voices found. Add .wav files to ~/Library/Application Support/TalkyMcTalkface/voices/')
+            logger.warning('No voices found. Add .wav files to ~/Library/Application Support/TalkyMcTalkface/voices/')
     except Exception as e:
         # Model not available yet - this is expected on first launch
         # User will need to trigger download via /model/download endpoint
-        print(f'Model not loaded (first launch or download required): {e}')
-        print('Use /model/download endpoint to download the model')
+        logger.warning('Model not loaded (first launch or download required): %s', e)
+        logger.warning('Use /model/download endpoint to download the model')
+
+    # Optionally pay first-generation warm-up (and compile) cost before serving jobs
+    if (MODEL_WARMUP or TORCH_COMPILE) and tts_service.is_loaded:
+        logger.info('Warming up model...')
+        try:
+            await tts_service.warmup()
+        except Exception as e:
+            logger.warning('Model warm-up failed: %s', e)
+
+    # Rescan voices whenever files are added to or removed from the voices directory
+    voices_watcher = asyncio.create_task(tts_service.watch_voices())
+    voices_watcher.add_done_callback(_log_watcher_failure)
 
     # Start job processor
-    print('Starting job processor...')
+    logger.info('Starting job processor...')
     job_processor = get_job_processor()
     await job_processor.start()
 
-    print(f'Server ready at http://{SERVER_HOST}:{SERVER_PORT}')
-    print('API documentation available at /docs')
-    print('Web UI available at /')
+    logger.info('Server ready at http://%s:%s', SERVER_HOST, SERVER_PORT)
+    logger.info('API documentation available at /docs')
+    logger.info('Web UI available at /')
 
     yield
 
     # Shutdown
-    print('Shutting down...')
+    logger.info('Shutting down...')
+
+    # Stop voices watcher - a watcher failure mustn't skip the rest of shutdown
+    voices_watcher.cancel()
+    try:
+        await voices_watcher
+    except asyncio.CancelledError:
+        pass
+    except Exception:
+        pass  # Already logged by _log_watcher_failure
 
     # Stop job processor
     await job_processor.stop()
@@ -105,7 +148,7 @@ async def lifespan(app: FastAPI):
     # Close database
     await close_db()
 
-    print('Shutdown complete.')
+    logger.info('Shutdown complete.')
 
 
 # Create FastAPI application
@@ -126,17 +169,39 @@ app.include_router(model_router)
 app.mount('/static', StaticFiles(directory=str(STATIC_DIR)), name='static')
 
 
+# The web UI page is static, so read and fingerprint it once
+INDEX_HTML = (TEMPLATES_DIR / 'index.html').read_bytes()
+INDEX_ETAG = f'"{hashlib.md5(INDEX_HTML, usedforsecurity=False).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str) -> bool:
+    """Check an If-None-Match header against the page's ETag (weak comparison)."""
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*' or tag.removeprefix('W/') == INDEX_ETAG:
+            return True
+    return False
+
+
 @app.get('/', include_in_schema=False)
-async def root():
-    """Serve the web UI."""
-    return FileResponse(str(TEMPLATES_DIR / 'index.html'))
+async def root(request: Request):
+    """Serve the web UI, answering revalidation requests with 304."""
+    # no-cache: browsers keep the page but check the ETag before reusing it
+    headers = {'ETag': INDEX_ETAG, 'Cache-Control': 'no-cache'}
+    if _etag_matches(request.headers.get('if-none-match', '')):
+        return Response(status_code=304, headers=headers)
+    return Response(INDEX_HTML, media_type='text/html', headers=headers)
 
 
 if __name__ == '__main__':
+    # Configured here, not at import, so importing the app leaves logging alone
+    logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s %(levelname)s %(message)s')
     uvicorn.run(
         app,
         host=SERVER_HOST,
         port=SERVER_PORT,
         reload=False,
-        log_level='info',
+        loop='uvloop',
+        http='httptools',
+        log_level=LOG_LEVEL.lower(),
     )
@@ -5,26 +5,57 @@ import os
 import asyncio
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from typing import AsyncGenerator
-from unittest.mock import MagicMock, patch, AsyncMock
+from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker, create_async_engine
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
 
 from app.models import Base
-from app.database import get_db
-from app.services.tts_service import TTSService, get_tts_service, reset_tts_service
+from app.models.job import Job, JobStatus
+from app.database import get_db, get_read_db, set_sqlite_pragmas
+from app.routers.health import _health_cache
+from app.routers.model import _status_cache
+from app.services.tts_service import reset_tts_service
 from app.services.job_processor import reset_job_processor
+from app.services.job_batcher import JobInsertBatcher, get_job_batcher, reset_job_batcher
+
+
+# Run async tests on uvloop, like the server, where it is installed
+# (loop factory hooks need pytest-asyncio 1.4+)
+if uvloop is not None and hasattr(pytest_asyncio.plugin, 'PytestAsyncioSpecs'):
+    def pytest_asyncio_loop_factories(config, item):
+        return {'uvloop': uvloop.new_event_loop}
+
+
+@pytest.fixture(autouse=True)
+def _reset_singletons():
+    """Give every test fresh service singletons."""
+    reset_tts_service()
+    reset_job_processor()
+    reset_job_batcher()
+    yield
+    reset_tts_service()
+    reset_job_processor()
+    reset_job_batcher()
 
 
 # Use a temporary database for tests
 @pytest.fixture(scope='session')
 def temp_db_path():
-    """Create a temporary database path for testing."""
+    """Create a temporary database path for testing (one per xdist worker)."""
+    worker_id = os.environ.get('PYTEST_XDIST_WORKER', 'gw0')
     with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir) / 'test.db'
+        yield Path(tmpdir) / f'test-{worker_id}.db'
 
 
 @pytest.fixture(scope='session')
@@ -34,109 +65,172 @@ def temp_audio_dir():
         yield Path(tmpdir)
 
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='session')
 def test_db_url(temp_db_path):
     """Generate test database URL."""
     return f'sqlite+aiosqlite:///{temp_db_path}'
 
 
-@pytest_asyncio.fixture(scope='function')
+@pytest_asyncio.fixture(scope='session')
 async def test_engine(test_db_url):
-    """Create a test database engine."""
+    """Create the test database engine and schema once per session."""
     engine = create_async_engine(test_db_url, echo=False)
+
+    # Same tuning as the app's engines; SQLAlchemy, not pysqlite, emits BEGIN
+    # so SAVEPOINTs work
+    @event.listens_for(engine.sync_engine, 'connect')
+    def _configure_connection(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        set_sqlite_pragmas(dbapi_connection, connection_record)
+
+    @event.listens_for(engine.sync_engine, 'begin')
+    def _emit_begin(conn):
+        if conn.get_execution_options().get('isolation_level') != 'AUTOCOMMIT':
+            conn.exec_driver_sql('BEGIN')
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield engine
     await engine.dispose()
 
 
-@pytest_asyncio.fixture(scope='function')
-async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
-    session_factory = async_sessionmaker(
-        test_engine,
+@pytest_asyncio.fixture
+async def test_connection(test_engine) -> AsyncGenerator[AsyncConnection, None]:
+    """Open a connection whose outer transaction is rolled back after each test."""
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        yield conn
+        await trans.rollback()
+
+
+@pytest.fixture
+def test_session_factory(test_connection):
+    """Session factory whose commits become SAVEPOINT releases on the test connection."""
+    return async_sessionmaker(
+        bind=test_connection,
         class_=AsyncSession,
         expire_on_commit=False,
+        join_transaction_mode='create_savepoint',
     )
-    async with session_factory() as session:
+
+
+@pytest_asyncio.fixture
+async def test_session(test_session_factory) -> AsyncGenerator[AsyncSession, None]:
+    """Create a test database session."""
+    async with test_session_factory() as session:
         yield session
 
 
 @pytest.fixture
-def mock_tts_service():
-    """Create a mock TTS service for testing."""
-    service = MagicMock(spec=TTSService)
-    service.is_loaded = True
-    service.get_voice_ids.return_value = ['jerry-seinfeld', 'custom-voice']
-    service.get_voices.return_value = [
-        MagicMock(
-            id='jerry-seinfeld',
-            display_name='Jerry Seinfeld',
-            file_path='/path/to/jerry_seinfeld_prompt.wav',
-            duration=None,
-        ),
-        MagicMock(
-            id='custom-voice',
-            display_name='Custom Voice',
-            file_path='/path/to/custom_voice_prompt.wav',
-            duration=None,
-        ),
-    ]
-    service.get_voice.return_value = MagicMock(
-        id='jerry-seinfeld',
-        display_name='Jerry Seinfeld',
-        file_path='/path/to/jerry_seinfeld_prompt.wav',
-        duration=None,
-    )
-    return service
+def seed_jobs(test_session_factory):
+    """Insert pending jobs directly, in one transaction, oldest first."""
+    async def seed(texts):
+        jobs = [Job(text=text, status=JobStatus.pending) for text in texts]
+        async with test_session_factory() as session:
+            session.add_all(jobs)
+            await session.commit()
+        return jobs
 
+    return seed
 
-@pytest_asyncio.fixture
-async def client(test_engine, mock_tts_service, temp_audio_dir):
-    """Create a test client with mocked dependencies."""
-    # Reset singletons
-    reset_tts_service()
-    reset_job_processor()
 
-    # Import app after resetting singletons
+class FakeTTSService:
+    """Plain stand-in for TTSService with two fixed voices and no model."""
+
+    def __init__(self):
+        self.is_loaded = True
+        self.voices_version = 0
+        self._voices = {
+            'jerry-seinfeld': SimpleNamespace(
+                id='jerry-seinfeld',
+                display_name='Jerry Seinfeld',
+                file_path='/path/to/jerry_seinfeld_prompt.wav',
+                duration=None,
+            ),
+            'custom-voice': SimpleNamespace(
+                id='custom-voice',
+                display_name='Custom Voice',
+                file_path='/path/to/custom_voice_prompt.wav',
+                duration=None,
+            ),
+        }
+
+    def scan_voices(self):
+        return self._voices
+
+    def get_voices(self):
+        return list(self._voices.values())
+
+    def get_voice(self, voice_id):
+        return self._voices.get(voice_id)
+
+    def get_voice_ids(self):
+        return tuple(self._voices)
+
+    def cleanup(self):
+        pass
+
+
+@pytest.fixture
+def mock_tts_service():
+    """Create a fake TTS service for testing."""
+    return FakeTTSService()
+
+
+@pytest.fixture(scope='session')
+def app():
+    """The FastAPI application, imported once per session."""
+    # Imported here rather than at module top so tests that don't need the
+    # server still collect when the TTS stack isn't installed
     from server import app
-    from app.database import async_session_factory
-    from app.services.job_processor import get_job_processor
 
-    # Create session factory for test engine
-    test_session_factory = async_sessionmaker(
-        test_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    return app
+
+
+@pytest.fixture(scope='session')
+def asgi_transport(app):
+    """ASGI transport shared by every test client."""
+    # Unhandled errors come back as 500s, like they would from uvicorn
+    return ASGITransport(app=app, raise_app_exceptions=False)
+
+
+@pytest_asyncio.fixture
+async def client(app, asgi_transport, test_session_factory, mock_tts_service, temp_audio_dir):
+    """Create a test client with mocked dependencies."""
+    # Singletons are reset by _reset_singletons; clear cached responses
+    _health_cache.clear()
+    _status_cache.clear()
 
     async def override_get_db():
         async with test_session_factory() as session:
             try:
                 yield session
-                await session.commit()
             except Exception:
                 await session.rollback()
                 raise
 
-    def override_get_tts_service():
-        return mock_tts_service
+    async def override_get_read_db():
+        async with test_session_factory() as session:
+            yield session
+
+    test_job_batcher = JobInsertBatcher(test_session_factory)
 
     # Override dependencies
     app.dependency_overrides[get_db] = override_get_db
-    app.dependency_overrides[get_tts_service] = override_get_tts_service
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_job_batcher] = lambda: test_job_batcher
+    app.state.tts_service = mock_tts_service
 
-    # Patch config
+    # Patch config, and the session factory the events stream opens per read
     with patch('app.config.AUDIO_DIR', temp_audio_dir):
         with patch('app.services.job_processor.AUDIO_DIR', temp_audio_dir):
-            transport = ASGITransport(app=app)
-            async with AsyncClient(transport=transport, base_url='http://test') as client:
-                yield client
+            with patch('app.routers.jobs.read_session_factory', test_session_factory):
+                async with AsyncClient(transport=asgi_transport, base_url='http://test') as client:
+                    yield client
 
     # Clean up
     app.dependency_overrides.clear()
-    reset_tts_service()
-    reset_job_processor()
+    del app.state.tts_service
 
 
 @pytest.fixture
@@ -146,8 +240,8 @@ def prompts_dir(tmp_path):
     prompts.mkdir()
 
     # Create dummy voice files
-    (prompts / 'jerry_seinfeld_prompt.wav').write_bytes(b'RIFF' + b'\x00' * 40)
-    (prompts / 'custom_voice_prompt.wav').write_bytes(b'RIFF' + b'\x00' * 40)
+    (prompts / 'jerry_seinfeld_prompt.wav').touch()
+    (prompts / 'custom_voice_prompt.wav').touch()
 
     return prompts
 
@@ -159,7 +253,7 @@ def voices_dir(tmp_path):
     voices.mkdir()
 
     # Create dummy voice files with exact filename stems (no _prompt suffix)
-    (voices / 'Jerry_Seinfeld.wav').write_bytes(b'RIFF' + b'\x00' * 40)
-    (voices / 'Custom_Voice.wav').write_bytes(b'RIFF' + b'\x00' * 40)
+    (voices / 'Jerry_Seinfeld.wav').touch()
+    (voices / 'Custom_Voice.wav').touch()
 
     return voices
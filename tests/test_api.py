@@ -3,12 +3,19 @@ Task Group 4: API Layer Tests
 
 Tests for voice and job endpoints.
 """
+import asyncio
+import json
+
 import pytest
 import pytest_asyncio
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
+from sqlalchemy import update
+
 from app.models.job import Job, JobStatus
+from app.routers import model as model_router
+from app.services.job_processor import get_job_processor
 
 
 class TestVoiceEndpoints:
@@ -60,8 +67,6 @@ class TestVoiceEndpoints:
     @pytest.mark.asyncio
     async def test_get_voice_not_found(self, client, mock_tts_service):
         """Test GET /voices/{id} returns 404 for invalid ID."""
-        mock_tts_service.get_voice.return_value = None
-
         response = await client.get('/voices/nonexistent-voice')
 
         assert response.status_code == 404
@@ -107,6 +112,19 @@ class TestJobEndpoints:
 
         assert response.status_code == 422  # Validation error
 
+    @pytest.mark.asyncio
+    async def test_create_job_returns_503_when_queue_full(self, client):
+        """Test POST /jobs returns 503 and keeps no job when the queue is full."""
+        processor = MagicMock()
+        processor.enqueue = AsyncMock(side_effect=asyncio.QueueFull)
+
+        with patch('app.routers.jobs.get_job_processor', return_value=processor):
+            response = await client.post('/jobs', json={'text': 'Hello world'})
+
+        assert response.status_code == 503
+        list_response = await client.get('/jobs')
+        assert list_response.json()['total'] == 0
+
     @pytest.mark.asyncio
     async def test_list_jobs_returns_paginated(self, client):
         """Test GET /jobs returns paginated list."""
@@ -138,11 +156,9 @@ class TestJobEndpoints:
             assert jobs[1]['text'] == 'First job'
 
     @pytest.mark.asyncio
-    async def test_list_jobs_pagination(self, client):
+    async def test_list_jobs_pagination(self, client, seed_jobs):
         """Test GET /jobs respects limit and offset."""
-        # Create some jobs
-        for i in range(5):
-            await client.post('/jobs', json={'text': f'Job {i}'})
+        await seed_jobs([f'Job {i}' for i in range(5)])
 
         response = await client.get('/jobs?limit=2&offset=1')
         data = response.json()
@@ -172,6 +188,47 @@ class TestJobEndpoints:
 
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('id_form', [str, str.upper], ids=['canonical', 'uppercase'])
+    async def test_job_events_stream_until_finished(self, client, test_session, id_form):
+        """Test GET /jobs/{id}/events sends each status change and ends when done."""
+        create_response = await client.post('/jobs', json={'text': 'Test job'})
+        job_id = create_response.json()['id']
+
+        stream = asyncio.create_task(client.get(f'/jobs/{id_form(job_id)}/events'))
+        processor = get_job_processor()
+
+        async def stream_waiting():
+            # Past its first read and blocked on the status event
+            while True:
+                changed = processor._status_events.get(job_id)
+                if changed is not None and changed._waiters:
+                    return
+                await asyncio.sleep(0)
+
+        await asyncio.wait_for(stream_waiting(), timeout=2)
+
+        await test_session.execute(
+            update(Job).where(Job.id == job_id).values(status=JobStatus.completed)
+        )
+        await test_session.commit()
+        processor.notify_status_changed(job_id)
+
+        response = await asyncio.wait_for(stream, timeout=5)
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/event-stream')
+        assert response.text == (
+            'data: {"status": "pending"}\n\n'
+            'data: {"status": "completed"}\n\n'
+        )
+
+    @pytest.mark.asyncio
+    async def test_job_events_not_found(self, client):
+        """Test GET /jobs/{id}/events returns 404 for invalid ID."""
+        response = await client.get('/jobs/nonexistent-id/events')
+
+        assert response.status_code == 404
+
     @pytest.mark.asyncio
     async def test_delete_single_job(self, client):
         """Test DELETE /jobs/{id} removes job."""
@@ -231,3 +288,73 @@ class TestAudioEndpoint:
         response = await client.get('/jobs/nonexistent-id/audio')
 
         assert response.status_code == 404
+
+
+@pytest.fixture
+def idle_download_state(monkeypatch):
+    """Start from an idle download state and restore the real one afterwards."""
+    monkeypatch.setattr(model_router, '_download_state', {
+        'status': 'idle',
+        'progress': 0.0,
+        'downloaded_bytes': 0,
+        'total_bytes': 0,
+        'message': '',
+    })
+
+
+async def wait_for_progress_subscriber():
+    """Wait, with a timeout, until a progress stream is blocked on its event."""
+    async def subscriber_waiting():
+        while not any(event._waiters for _, event in model_router._subscribers):
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(subscriber_waiting(), timeout=2)
+
+
+class TestModelEndpoints:
+    """Tests for /model endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_progress_stream_sends_updates_from_worker_thread(self, client, idle_download_state):
+        """Test GET /model/progress/stream sends a frame per update made off the event loop."""
+        stream = asyncio.create_task(client.get('/model/progress/stream'))
+        await wait_for_progress_subscriber()
+
+        # Downloads publish progress from an executor thread
+        await asyncio.to_thread(
+            model_router._update_download_state,
+            status='completed', progress=1.0, message='Model download complete',
+        )
+
+        response = await asyncio.wait_for(stream, timeout=5)
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/event-stream')
+        frames = [
+            json.loads(line.removeprefix('data: '))
+            for line in response.text.split('\n\n') if line
+        ]
+        assert [frame['status'] for frame in frames] == ['idle', 'completed']
+        assert model_router._subscribers == set()
+
+    @pytest.mark.asyncio
+    async def test_progress_stream_unsubscribes_on_disconnect(self, client, idle_download_state):
+        """Test a progress stream closed mid-download leaves no subscriber behind."""
+        stream = asyncio.create_task(client.get('/model/progress/stream'))
+        await wait_for_progress_subscriber()
+
+        stream.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await stream
+
+        assert model_router._subscribers == set()
+
+    @pytest.mark.asyncio
+    async def test_model_status_cached_within_ttl(self, client, mock_tts_service):
+        """Test GET /model/status builds its response once per TTL window."""
+        mock_tts_service.get_voice_ids = MagicMock(return_value=('jerry-seinfeld',))
+
+        first = await client.get('/model/status')
+        second = await client.get('/model/status')
+
+        assert first.json() == second.json() == {'loaded': True, 'voices': ['jerry-seinfeld']}
+        mock_tts_service.get_voice_ids.assert_called_once()
@@ -4,6 +4,7 @@ Tests for PyInstaller bundled executable.
 These tests verify that the bundled TalkyMcTalkface server works correctly
 when packaged as a standalone executable.
 """
+import json
 import os
 import sys
 import subprocess
@@ -98,6 +99,13 @@ def bundled_server():
         terminate_process(process)
 
 
+@pytest.fixture(scope='module')
+def http():
+    """HTTP client shared by the module's tests, so connections are kept alive."""
+    with httpx.Client(base_url=SERVER_URL, timeout=REQUEST_TIMEOUT) as client:
+        yield client
+
+
 class TestBundledExecutableLaunch:
     """Tests for bundled executable launch and basic functionality."""
 
@@ -111,7 +119,7 @@ class TestBundledExecutableLaunch:
         """
         assert bundled_server.poll() is None, 'Server process exited unexpectedly'
 
-    def test_server_responds_to_health_check(self, bundled_server):
+    def test_server_responds_to_health_check(self, bundled_server, http):
         """
         Test server responds to health check.
 
@@ -120,7 +128,7 @@ class TestBundledExecutableLaunch:
         - Response contains expected fields
         - Model is loaded
         """
-        response = httpx.get(f'{SERVER_URL}/health', timeout=REQUEST_TIMEOUT)
+        response = http.get('/health')
 
         assert response.status_code == 200
         data = response.json()
@@ -133,7 +141,7 @@ class TestBundledExecutableLaunch:
 class TestBundledTTSFunctionality:
     """Tests for TTS functionality in bundled executable."""
 
-    def test_tts_job_creation_and_processing(self, bundled_server):
+    def test_tts_job_creation_and_processing(self, bundled_server, http):
         """
         Test TTS endpoint works with bundled dependencies.
 
@@ -150,45 +158,34 @@ class TestBundledTTSFunctionality:
             'text': 'Hello from the bundled executable test.',
             'voice_id': None,  # No voice cloning, use default synthesis
         }
-        response = httpx.post(
-            f'{SERVER_URL}/jobs',
-            json=job_data,
-            timeout=REQUEST_TIMEOUT
-        )
+        response = http.post('/jobs', json=job_data)
         assert response.status_code == 201
         job = response.json()
         job_id = job['id']
         assert job['status'] in ['pending', 'processing']
 
-        # Wait for job completion (TTS can take 10-30 seconds)
+        # Follow status events until the job finishes (TTS can take 10-30 seconds)
         max_wait = 60
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
-            status_response = httpx.get(
-                f'{SERVER_URL}/jobs/{job_id}',
-                timeout=REQUEST_TIMEOUT
-            )
-            assert status_response.status_code == 200
-            job_status = status_response.json()
-
-            if job_status['status'] == 'completed':
-                break
-            elif job_status['status'] == 'failed':
-                pytest.fail(f'TTS job failed: {job_status.get("error_message")}')
-
-            time.sleep(2)
-        else:
-            pytest.fail(f'TTS job did not complete within {max_wait}s')
+        status = None
+        with http.stream('GET', f'/jobs/{job_id}/events', timeout=max_wait) as events:
+            assert events.status_code == 200
+            for line in events.iter_lines():
+                if line.startswith('data: '):
+                    status = json.loads(line[len('data: '):])['status']
+
+        status_response = http.get(f'/jobs/{job_id}')
+        assert status_response.status_code == 200
+        job_status = status_response.json()
+        if status == 'failed':
+            pytest.fail(f'TTS job failed: {job_status.get("error_message")}')
+        assert status == 'completed'
 
         # Verify job has audio file
         assert job_status['file_size'] is not None
         assert job_status['file_size'] > 0
 
         # Verify audio file is accessible
-        audio_response = httpx.get(
-            f'{SERVER_URL}/jobs/{job_id}/audio',
-            timeout=REQUEST_TIMEOUT
-        )
+        audio_response = http.get(f'/jobs/{job_id}/audio')
         assert audio_response.status_code == 200
         assert audio_response.headers.get('content-type') in [
             'audio/wav',
@@ -196,7 +193,7 @@ class TestBundledTTSFunctionality:
             'audio/wave',
         ]
 
-    def test_voices_endpoint_returns_available_voices(self, bundled_server):
+    def test_voices_endpoint_returns_available_voices(self, bundled_server, http):
         """
         Test that voices endpoint returns available voices.
 
@@ -205,7 +202,7 @@ class TestBundledTTSFunctionality:
         - List may be empty (voices are user-managed, not bundled)
         - If voices exist, they have correct structure
         """
-        response = httpx.get(f'{SERVER_URL}/voices', timeout=REQUEST_TIMEOUT)
+        response = http.get('/voices')
         assert response.status_code == 200
         voices = response.json()
         assert isinstance(voices, list)
@@ -3,13 +3,80 @@ Task Group 2: Database Layer Tests
 
 Tests for SQLite database setup, WAL mode, and Job model.
 """
+import contextlib
+import os
+import sqlite3
+import uuid
+from unittest.mock import patch
+
 import pytest
 import pytest_asyncio
 from datetime import datetime
-from sqlalchemy import select, text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import IntegrityError
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import close_db, get_read_db, init_db
+from app.models.job import Job, JobStatus, _uuid_pool
+
+
+# The jobs table as the first release created it: string ids, a
+# Python-side created_at default and no status constraint
+LEGACY_JOBS_TABLE = """
+CREATE TABLE jobs (
+    id VARCHAR(36) NOT NULL,
+    text TEXT NOT NULL,
+    voice_id VARCHAR(100),
+    status VARCHAR(20) NOT NULL,
+    created_at DATETIME NOT NULL,
+    completed_at DATETIME,
+    audio_path TEXT,
+    error_message TEXT,
+    duration_ms INTEGER,
+    file_size_bytes INTEGER,
+    PRIMARY KEY (id)
+)
+"""
+
+
+@pytest.fixture
+def legacy_jobs():
+    """One job per status, as rows for the legacy jobs table."""
+    return [
+        (
+            str(uuid.uuid4()),
+            f'Job {i}',
+            status,
+            f'2024-01-0{i + 1} 12:00:00.000000',
+            f'/audio/job-{i}.wav' if status == JobStatus.completed else None,
+        )
+        for i, status in enumerate(JobStatus.all)
+    ]
+
+
+@pytest_asyncio.fixture
+async def legacy_engine(tmp_path, legacy_jobs):
+    """Engine on a database file created with the legacy jobs schema."""
+    db_path = tmp_path / 'legacy.db'
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        conn.execute(LEGACY_JOBS_TABLE)
+        conn.executemany(
+            'INSERT INTO jobs (id, text, status, created_at, audio_path) VALUES (?, ?, ?, ?, ?)',
+            legacy_jobs,
+        )
+        conn.commit()
 
-from app.models.job import Job, JobStatus
+    engine = create_async_engine(f'sqlite+aiosqlite:///{db_path}')
+    yield engine
+    await engine.dispose()
+
+
+async def init_db_on(engine):
+    """Run init_db() against the given engine instead of the app database."""
+    with patch('app.database.write_engine', engine), \
+         patch('app.database.ensure_directories'):
+        await init_db()
 
 
 class TestDatabaseConfiguration:
@@ -30,49 +97,90 @@ class TestWALMode:
     @pytest.mark.asyncio
     async def test_wal_mode_can_be_enabled(self, test_engine):
         """Test that WAL mode can be enabled on the database."""
-        async with test_engine.begin() as conn:
+        # journal_mode can't change inside a transaction, so run outside one
+        async with test_engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level='AUTOCOMMIT')
             result = await conn.execute(text('PRAGMA journal_mode=WAL'))
             mode = result.scalar()
             # SQLite returns 'wal' when WAL mode is enabled
             assert mode in ('wal', 'WAL')
 
-
-class TestJobModel:
-    """Tests for Job SQLAlchemy model."""
+    @pytest.mark.asyncio
+    async def test_connections_get_performance_pragmas(self, test_engine):
+        """Test every pooled connection gets the SQLITE_PRAGMAS tuning."""
+        expected = {
+            'journal_mode': 'wal',
+            'synchronous': 1,  # NORMAL
+            'cache_size': -64000,
+            'temp_store': 2,  # MEMORY
+            'busy_timeout': 5000,
+            'mmap_size': 268435456,
+        }
+        async with test_engine.connect() as conn:
+            for name, value in expected.items():
+                result = await conn.execute(text(f'PRAGMA {name}'))
+                assert result.scalar() == value, name
+
+
+class TestCloseDB:
+    """Tests for database shutdown."""
 
     @pytest.mark.asyncio
-    async def test_create_job(self, test_session: AsyncSession):
-        """Test creating a job record."""
-        job = Job(
-            text='Hello world',
-            voice_id=None,
-            status=JobStatus.pending.value,
-        )
-        test_session.add(job)
-        await test_session.commit()
+    async def test_close_db_optimizes_and_disposes(self, tmp_path):
+        """Test close_db() runs PRAGMA optimize and then disposes both engines."""
+        url = f'sqlite+aiosqlite:///{tmp_path / "talky.db"}'
+        write_engine = create_async_engine(url)
+        read_engine = create_async_engine(url)
+        statements = []
 
-        # Verify job was created
-        result = await test_session.execute(select(Job).where(Job.id == job.id))
-        saved_job = result.scalar_one()
+        @event.listens_for(write_engine.sync_engine, 'before_cursor_execute')
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
 
-        assert saved_job.text == 'Hello world'
-        assert saved_job.voice_id is None
-        assert saved_job.status == JobStatus.pending.value
+        with patch('app.database.write_engine', write_engine), \
+             patch('app.database.read_engine', read_engine):
+            await close_db()
+
+        assert 'PRAGMA optimize' in statements
+        assert write_engine.pool.checkedin() == 0
+        assert read_engine.pool.checkedin() == 0
+
+
+class TestJobModel:
+    """Tests for Job SQLAlchemy model."""
 
     @pytest.mark.asyncio
     async def test_job_has_uuid_id(self, test_session: AsyncSession):
         """Test job gets a UUID ID automatically."""
-        job = Job(text='Test text', status=JobStatus.pending.value)
+        job = Job(text='Test text', status=JobStatus.pending)
         test_session.add(job)
         await test_session.commit()
 
         assert job.id is not None
         assert len(job.id) == 36  # UUID format: 8-4-4-4-12
 
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+    def test_forked_child_does_not_repeat_ids(self):
+        """Test a forked child draws fresh ids instead of the parent's buffer."""
+        _uuid_pool.next()  # Make sure the parent has a partly used buffer
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, _uuid_pool.next().bytes)
+            os._exit(0)
+
+        os.close(write_fd)
+        child_id = os.read(read_fd, 16)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        assert child_id != _uuid_pool.next().bytes
+
     @pytest.mark.asyncio
     async def test_job_created_at_auto_populates(self, test_session: AsyncSession):
         """Test created_at is automatically populated."""
-        job = Job(text='Test text', status=JobStatus.pending.value)
+        job = Job(text='Test text', status=JobStatus.pending)
         test_session.add(job)
         await test_session.commit()
 
@@ -82,82 +190,169 @@ class TestJobModel:
     @pytest.mark.asyncio
     async def test_job_status_transitions(self, test_session: AsyncSession):
         """Test job status can be updated through transitions."""
-        job = Job(text='Test text', status=JobStatus.pending.value)
+        job = Job(text='Test text', status=JobStatus.pending)
         test_session.add(job)
         await test_session.commit()
 
         # Transition to processing
-        job.status = JobStatus.processing.value
+        job.status = JobStatus.processing
         await test_session.commit()
 
         result = await test_session.execute(select(Job).where(Job.id == job.id))
         updated_job = result.scalar_one()
-        assert updated_job.status == JobStatus.processing.value
+        assert updated_job.status == JobStatus.processing
 
         # Transition to completed
-        job.status = JobStatus.completed.value
-        job.completed_at = datetime.utcnow()
+        job.status = JobStatus.completed
+        job.completed_at = datetime(2025, 1, 1, 12, 0, 0)
         await test_session.commit()
 
         result = await test_session.execute(select(Job).where(Job.id == job.id))
         completed_job = result.scalar_one()
-        assert completed_job.status == JobStatus.completed.value
+        assert completed_job.status == JobStatus.completed
         assert completed_job.completed_at is not None
 
     @pytest.mark.asyncio
-    async def test_job_with_all_fields(self, test_session: AsyncSession):
-        """Test job with all fields populated."""
-        job = Job(
-            text='Test text',
-            voice_id='jerry-seinfeld',
-            status=JobStatus.completed.value,
-            completed_at=datetime.utcnow(),
-            audio_path='/path/to/audio.wav',
-            error_message=None,
-            duration_ms=1500,
-            file_size_bytes=123456,
-        )
+    @pytest.mark.parametrize('fields', [
+        pytest.param(
+            {'text': 'Hello world', 'voice_id': None, 'status': JobStatus.pending},
+            id='pending',
+        ),
+        pytest.param(
+            {
+                'text': 'Test text',
+                'voice_id': 'jerry-seinfeld',
+                'status': JobStatus.completed,
+                'completed_at': datetime(2025, 1, 1, 12, 0, 0),
+                'audio_path': '/path/to/audio.wav',
+                'error_message': None,
+                'duration_ms': 1500,
+                'file_size_bytes': 123456,
+            },
+            id='all-fields',
+        ),
+        pytest.param(
+            {
+                'text': 'Test text',
+                'status': JobStatus.failed,
+                'error_message': 'Model inference error',
+                'duration_ms': 100,
+            },
+            id='failed',
+        ),
+    ])
+    async def test_job_roundtrip(self, test_session: AsyncSession, fields):
+        """Test a job's fields are saved and read back unchanged."""
+        job = Job(**fields)
         test_session.add(job)
         await test_session.commit()
 
-        result = await test_session.execute(select(Job).where(Job.id == job.id))
+        # Reload from the database rather than the identity map
+        result = await test_session.execute(
+            select(Job).where(Job.id == job.id).execution_options(populate_existing=True)
+        )
         saved_job = result.scalar_one()
 
-        assert saved_job.voice_id == 'jerry-seinfeld'
-        assert saved_job.audio_path == '/path/to/audio.wav'
-        assert saved_job.duration_ms == 1500
-        assert saved_job.file_size_bytes == 123456
+        for name, value in fields.items():
+            assert getattr(saved_job, name) == value, name
 
     @pytest.mark.asyncio
-    async def test_job_failed_status(self, test_session: AsyncSession):
-        """Test job with failed status and error message."""
-        job = Job(
-            text='Test text',
-            status=JobStatus.failed.value,
-            error_message='Model inference error',
-            duration_ms=100,
-        )
-        test_session.add(job)
-        await test_session.commit()
-
-        result = await test_session.execute(select(Job).where(Job.id == job.id))
-        saved_job = result.scalar_one()
-
-        assert saved_job.status == JobStatus.failed.value
-        assert saved_job.error_message == 'Model inference error'
+    async def test_invalid_status_rejected(self, test_session: AsyncSession):
+        """Test the database rejects a status outside JobStatus.all."""
+        test_session.add(Job(text='Test text', status='bogus'))
+        with pytest.raises(IntegrityError):
+            await test_session.commit()
 
 
 class TestJobStatus:
-    """Tests for JobStatus enum."""
+    """Tests for JobStatus constants."""
 
     def test_job_status_values(self):
-        """Test JobStatus enum has correct values."""
-        assert JobStatus.pending.value == 'pending'
-        assert JobStatus.processing.value == 'processing'
-        assert JobStatus.completed.value == 'completed'
-        assert JobStatus.failed.value == 'failed'
-
-    def test_job_status_is_string(self):
-        """Test JobStatus inherits from str for JSON serialization."""
-        assert isinstance(JobStatus.pending, str)
+        """Test JobStatus constants are plain strings with the expected values."""
+        assert JobStatus.all == ('pending', 'processing', 'completed', 'failed')
         assert JobStatus.pending == 'pending'
+        assert JobStatus.processing == 'processing'
+        assert JobStatus.completed == 'completed'
+        assert JobStatus.failed == 'failed'
+        assert all(type(status) is str for status in JobStatus.all)
+
+
+class TestMigrations:
+    """Tests for upgrading databases created by earlier releases."""
+
+    @pytest.mark.asyncio
+    async def test_init_db_migrates_legacy_jobs_table(self, legacy_engine, legacy_jobs):
+        """Test init_db() rebuilds a legacy jobs table without losing jobs, and is idempotent."""
+        expected = [
+            (job_id, text_, status, datetime.fromisoformat(created_at), audio_path)
+            for job_id, text_, status, created_at, audio_path in legacy_jobs
+        ]
+
+        for _ in range(2):  # The second run must leave everything as it is
+            await init_db_on(legacy_engine)
+
+            async with legacy_engine.connect() as conn:
+                result = await conn.execute(
+                    select(Job.id, Job.text, Job.status, Job.created_at, Job.audio_path)
+                    .order_by(Job.created_at)
+                )
+                assert [tuple(row) for row in result] == expected
+
+                tables = await conn.scalars(text("SELECT name FROM sqlite_master WHERE type = 'table'"))
+                assert 'jobs_old' not in tables.all()
+
+                indexes = await conn.execute(text('PRAGMA index_list(jobs)'))
+                assert {index.name for index in Job.__table__.indexes} <= {row.name for row in indexes}
+
+                with pytest.raises(IntegrityError):
+                    await conn.execute(
+                        text("INSERT INTO jobs (id, text, status) VALUES (:id, 'Bad', 'bogus')"),
+                        {'id': uuid.uuid4().bytes},
+                    )
+                await conn.rollback()
+
+    @pytest.mark.asyncio
+    async def test_init_db_backfills_missing_indexes(self, tmp_path):
+        """Test init_db() adds indexes missing from an otherwise current jobs table."""
+        engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "talky.db"}')
+        try:
+            await init_db_on(engine)
+            async with engine.begin() as conn:
+                await conn.execute(text('DROP INDEX ix_jobs_created_at'))
+
+            await init_db_on(engine)
+
+            async with engine.connect() as conn:
+                indexes = await conn.execute(text('PRAGMA index_list(jobs)'))
+                assert 'ix_jobs_created_at' in {row.name for row in indexes}
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_init_db_converts_legacy_ids_to_blobs(
+        self, legacy_engine, legacy_jobs, app, asgi_transport,
+    ):
+        """Test string job ids become 16-byte BLOBs and still resolve through the API."""
+        await init_db_on(legacy_engine)
+
+        async with legacy_engine.connect() as conn:
+            id_types = await conn.scalars(text('SELECT typeof(id) FROM jobs'))
+            assert id_types.all() == ['blob'] * len(legacy_jobs)
+
+        session_factory = async_sessionmaker(legacy_engine, class_=AsyncSession)
+
+        async def override_get_read_db():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_read_db] = override_get_read_db
+        try:
+            async with AsyncClient(transport=asgi_transport, base_url='http://test') as client:
+                for job_id, text_, *_ in legacy_jobs:
+                    response = await client.get(f'/jobs/{job_id}')
+
+                    assert response.status_code == 200
+                    assert response.json()['id'] == job_id
+                    assert response.json()['text'] == text_
+        finally:
+            del app.dependency_overrides[get_read_db]
@@ -7,6 +7,7 @@ Tests for Task 6.1:
 - Test DMG mounts and contains expected contents
 """
 import os
+import plistlib
 import subprocess
 import tempfile
 from pathlib import Path
@@ -20,34 +21,30 @@ APP_BUILD_DIR = PROJECT_ROOT / 'build' / 'Release' / 'TalkyMcTalkface.app'
 DMG_PATH = PROJECT_ROOT / 'dist' / 'TalkyMcTalkface.dmg'
 
 
-class TestAppBundleStructure:
-    """Test that the .app bundle has correct structure."""
-
-    @pytest.fixture
-    def app_path(self):
-        """Get the .app bundle path, skip if not built."""
-        # Check multiple possible locations for the built app
-        possible_paths = [
-            APP_BUILD_DIR,
-            PROJECT_ROOT / 'dist' / 'TalkyMcTalkface.app',
-            Path.home() / 'Library' / 'Developer' / 'Xcode' / 'DerivedData',
-        ]
-
-        # Look for the app in DerivedData if not in standard locations
-        for path in possible_paths[:2]:
-            if path.exists():
-                return path
-
-        # Search DerivedData for the app
-        derived_data = possible_paths[2]
-        if derived_data.exists():
-            for derived_dir in derived_data.iterdir():
-                if 'TalkyMcTalkface' in derived_dir.name:
-                    app_path = derived_dir / 'Build' / 'Products' / 'Release' / 'TalkyMcTalkface.app'
+@pytest.fixture(scope='module')
+def app_path():
+    """Get the .app bundle path, skip if not built. Looked up once per module."""
+    # Check the standard build locations first
+    for path in (APP_BUILD_DIR, PROJECT_ROOT / 'dist' / 'TalkyMcTalkface.app'):
+        if path.exists():
+            return path
+
+    # Search DerivedData for the app
+    derived_data = Path.home() / 'Library' / 'Developer' / 'Xcode' / 'DerivedData'
+    if derived_data.exists():
+        # DirEntry.is_dir() uses the type from the directory listing, no stat
+        with os.scandir(derived_data) as entries:
+            for entry in entries:
+                if 'TalkyMcTalkface' in entry.name and entry.is_dir(follow_symlinks=False):
+                    app_path = Path(entry.path) / 'Build' / 'Products' / 'Release' / 'TalkyMcTalkface.app'
                     if app_path.exists():
                         return app_path
 
-        pytest.skip('TalkyMcTalkface.app not found. Build the app first with: xcodebuild -project TalkyMcTalkface/TalkyMcTalkface.xcodeproj -scheme TalkyMcTalkface -configuration Release build')
+    pytest.skip('TalkyMcTalkface.app not found. Build the app first with: xcodebuild -project TalkyMcTalkface/TalkyMcTalkface.xcodeproj -scheme TalkyMcTalkface -configuration Release build')
+
+
+class TestAppBundleStructure:
+    """Test that the .app bundle has correct structure."""
 
     def test_app_bundle_exists(self, app_path):
         """Test that .app bundle exists and is a directory."""
@@ -74,41 +71,19 @@ class TestAppBundleStructure:
         info_plist = app_path / 'Contents' / 'Info.plist'
         assert info_plist.exists(), 'Info.plist missing from .app bundle'
 
-        # Verify Info.plist is valid
-        result = subprocess.run(
-            ['plutil', '-lint', str(info_plist)],
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0, f'Info.plist is invalid: {result.stderr}'
+        # Verify Info.plist parses (XML or binary) and names the bundle
+        with info_plist.open('rb') as f:
+            try:
+                info = plistlib.load(f)
+            except Exception as e:
+                pytest.fail(f'Info.plist is invalid: {e}')
+        assert 'CFBundleIdentifier' in info, 'Info.plist has no CFBundleIdentifier'
+        assert 'CFBundleExecutable' in info, 'Info.plist has no CFBundleExecutable'
 
 
 class TestCodeSignature:
     """Test code signature validity."""
 
-    @pytest.fixture
-    def app_path(self):
-        """Get the .app bundle path, skip if not built."""
-        possible_paths = [
-            APP_BUILD_DIR,
-            PROJECT_ROOT / 'dist' / 'TalkyMcTalkface.app',
-        ]
-
-        for path in possible_paths:
-            if path.exists():
-                return path
-
-        # Search DerivedData
-        derived_data = Path.home() / 'Library' / 'Developer' / 'Xcode' / 'DerivedData'
-        if derived_data.exists():
-            for derived_dir in derived_data.iterdir():
-                if 'TalkyMcTalkface' in derived_dir.name:
-                    app_path = derived_dir / 'Build' / 'Products' / 'Release' / 'TalkyMcTalkface.app'
-                    if app_path.exists():
-                        return app_path
-
-        pytest.skip('TalkyMcTalkface.app not found')
-
     def test_code_signature_valid(self, app_path):
         """Test that code signature is valid (if signed)."""
         result = subprocess.run(
@@ -143,44 +118,50 @@ class TestCodeSignature:
             f'Could not read code signature requirements: {result.stderr}'
 
 
+@pytest.fixture(scope='module')
+def mounted_dmg():
+    """Mount DMG once for the module and yield the mount point, unmount after."""
+    if not DMG_PATH.exists():
+        pytest.skip(f'DMG not found at {DMG_PATH}. Build with: ./scripts/build_distribution.sh')
+
+    # Create temporary mount point
+    mount_point = Path(tempfile.mkdtemp(prefix='talky_dmg_'))
+
+    try:
+        # Mount DMG read-only, skipping checksum verification and fsck -
+        # the tests only look at the directory tree
+        result = subprocess.run(
+            [
+                'hdiutil', 'attach', str(DMG_PATH),
+                '-mountpoint', str(mount_point),
+                '-nobrowse', '-readonly', '-noverify', '-noautofsck',
+            ],
+            capture_output=True,
+            text=True
+        )
+
+        if result.returncode != 0:
+            pytest.skip(f'Failed to mount DMG: {result.stderr}')
+
+        yield mount_point
+
+    finally:
+        # Unmount DMG
+        subprocess.run(
+            ['hdiutil', 'detach', str(mount_point), '-force'],
+            capture_output=True
+        )
+        # Clean up mount point directory
+        if mount_point.exists():
+            try:
+                mount_point.rmdir()
+            except OSError:
+                pass
+
+
 class TestDMGContents:
     """Test DMG distribution package."""
 
-    @pytest.fixture
-    def mounted_dmg(self):
-        """Mount DMG and yield the mount point, unmount after test."""
-        if not DMG_PATH.exists():
-            pytest.skip(f'DMG not found at {DMG_PATH}. Build with: ./scripts/build_distribution.sh')
-
-        # Create temporary mount point
-        mount_point = Path(tempfile.mkdtemp(prefix='talky_dmg_'))
-
-        try:
-            # Mount DMG
-            result = subprocess.run(
-                ['hdiutil', 'attach', str(DMG_PATH), '-mountpoint', str(mount_point), '-nobrowse'],
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode != 0:
-                pytest.skip(f'Failed to mount DMG: {result.stderr}')
-
-            yield mount_point
-
-        finally:
-            # Unmount DMG
-            subprocess.run(
-                ['hdiutil', 'detach', str(mount_point), '-force'],
-                capture_output=True
-            )
-            # Clean up mount point directory
-            if mount_point.exists():
-                try:
-                    mount_point.rmdir()
-                except OSError:
-                    pass
-
     def test_dmg_contains_app(self, mounted_dmg):
         """Test that DMG contains the .app bundle."""
         app_path = mounted_dmg / 'TalkyMcTalkface.app'
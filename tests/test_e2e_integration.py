@@ -78,15 +78,12 @@ class TestSwiftPythonCommunication:
         - SubprocessManager polls /health every few seconds
         - Server must handle concurrent requests without degradation
         """
-        # Simulate 10 rapid health checks (more aggressive than typical polling)
-        tasks = [client.get('/health') for _ in range(10)]
-        responses = await asyncio.gather(*tasks)
+        # Simulate 50 concurrent health checks (far more aggressive than typical polling)
+        responses = await asyncio.gather(*(client.get('/health') for _ in range(50)))
 
         # All should succeed
-        for response in responses:
-            assert response.status_code == 200
-            data = response.json()
-            assert data['status'] == 'ok'
+        assert all(response.status_code == 200 for response in responses)
+        assert all(response.json()['status'] == 'ok' for response in responses)
 
     @pytest.mark.asyncio
     async def test_job_creation_response_format_for_swift(self, client):
@@ -206,15 +203,15 @@ class TestAppRestartScenarios:
         assert get_response.json()['text'] == 'Pre-restart job'
 
     @pytest.mark.asyncio
-    async def test_job_history_maintains_order_across_sessions(self, client):
+    async def test_job_history_maintains_order_across_sessions(self, client, seed_jobs):
         """
         Test job list maintains newest-first order.
 
         Critical for Swift app's history view to show recent jobs first.
         """
-        # Create multiple jobs
-        for i in range(3):
-            await client.post('/jobs', json={'text': f'Job {i}'})
+        # Insert jobs in a known order in one transaction, so this also
+        # checks that ties on created_at are broken by insertion order
+        await seed_jobs([f'Job {i}' for i in range(3)])
 
         # Fetch job list
         list_response = await client.get('/jobs')
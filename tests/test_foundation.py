@@ -4,6 +4,7 @@ Task Group 1: Foundation Layer Tests
 Tests for server foundation, Perth patch, and health endpoint.
 """
 import sys
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -11,6 +12,10 @@ import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 
 
+# server.py source, read once for the import-order checks
+SERVER_SOURCE = (Path(__file__).parent.parent / 'server.py').read_text()
+
+
 class TestPerthPatch:
     """Tests for Perth watermarker patch."""
 
@@ -28,16 +33,11 @@ class TestPerthPatch:
 
     def test_server_patches_perth_at_top_of_file(self):
         """Test that server.py patches perth before any other chatterbox imports."""
-        # Read server.py and verify the patch happens early
-        from pathlib import Path
-        server_path = Path(__file__).parent.parent / 'server.py'
-        content = server_path.read_text()
-
         # Find where perth patch happens
-        perth_patch_pos = content.find('perth.PerthImplicitWatermarker = perth.DummyWatermarker')
+        perth_patch_pos = SERVER_SOURCE.find('perth.PerthImplicitWatermarker = perth.DummyWatermarker')
 
         # Find where chatterbox is imported (in app modules)
-        chatterbox_import_pos = content.find('from chatterbox')
+        chatterbox_import_pos = SERVER_SOURCE.find('from chatterbox')
 
         # The patch should exist
         assert perth_patch_pos != -1, 'Perth patch not found in server.py'
@@ -52,36 +52,16 @@ class TestHealthEndpoint:
     """Tests for GET /health endpoint."""
 
     @pytest.mark.asyncio
-    async def test_health_endpoint_returns_ok(self, client):
-        """Test health endpoint returns 200 with status ok."""
+    async def test_health_response_schema(self, client):
+        """Test health endpoint returns status, model_loaded, voices and version."""
         response = await client.get('/health')
         assert response.status_code == 200
         data = response.json()
-        assert data['status'] == 'ok'
-
-    @pytest.mark.asyncio
-    async def test_health_endpoint_returns_model_loaded(self, client):
-        """Test health endpoint returns model_loaded boolean."""
-        response = await client.get('/health')
-        data = response.json()
-        assert 'model_loaded' in data
-        assert isinstance(data['model_loaded'], bool)
 
-    @pytest.mark.asyncio
-    async def test_health_endpoint_returns_available_voices(self, client):
-        """Test health endpoint returns list of available voices."""
-        response = await client.get('/health')
-        data = response.json()
-        assert 'available_voices' in data
-        assert isinstance(data['available_voices'], list)
-
-    @pytest.mark.asyncio
-    async def test_health_endpoint_returns_version(self, client):
-        """Test health endpoint returns server version string."""
-        response = await client.get('/health')
-        data = response.json()
-        assert 'version' in data
-        assert isinstance(data['version'], str)
+        assert data['status'] == 'ok'
+        assert isinstance(data.get('model_loaded'), bool), 'model_loaded must be a boolean'
+        assert isinstance(data.get('available_voices'), list), 'available_voices must be a list'
+        assert isinstance(data.get('version'), str), 'version must be a string'
 
 
 class TestServerConfiguration:
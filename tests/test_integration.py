@@ -10,6 +10,7 @@ import pytest
 import pytest_asyncio
 
 from app.models.job import JobStatus
+from app.services.job_processor import get_job_processor
 
 
 class TestEndToEndWorkflow:
@@ -64,55 +65,31 @@ class TestVoiceSelection:
     """Tests for voice selection in job creation."""
 
     @pytest.mark.asyncio
-    async def test_create_job_with_valid_voice(self, client):
-        """Test creating job with valid voice_id."""
-        response = await client.post('/jobs', json={
-            'text': 'Hello',
-            'voice_id': 'jerry-seinfeld',
-        })
+    @pytest.mark.parametrize('body, expected_voice', [
+        pytest.param({'text': 'Hello', 'voice_id': 'jerry-seinfeld'}, 'jerry-seinfeld', id='valid-voice'),
+        pytest.param({'text': 'Hello', 'voice_id': None}, None, id='null-voice'),
+        pytest.param({'text': 'Hello'}, None, id='no-voice'),
+    ])
+    async def test_create_job_voice_selection(self, client, body, expected_voice):
+        """Test creating jobs with a voice, a null voice (default), or no voice_id."""
+        response = await client.post('/jobs', json=body)
 
         assert response.status_code == 201
         data = response.json()
-        assert data['voice_id'] == 'jerry-seinfeld'
-
-    @pytest.mark.asyncio
-    async def test_create_job_with_null_voice(self, client):
-        """Test creating job with null voice uses default."""
-        response = await client.post('/jobs', json={
-            'text': 'Hello',
-            'voice_id': None,
-        })
-
-        assert response.status_code == 201
-        data = response.json()
-        assert data['voice_id'] is None
-
-    @pytest.mark.asyncio
-    async def test_create_job_without_voice(self, client):
-        """Test creating job without voice_id parameter."""
-        response = await client.post('/jobs', json={
-            'text': 'Hello',
-        })
-
-        assert response.status_code == 201
-        data = response.json()
-        assert data['voice_id'] is None
+        assert data['voice_id'] == expected_voice
 
 
 class TestErrorHandling:
     """Tests for error handling."""
 
     @pytest.mark.asyncio
-    async def test_missing_text_returns_422(self, client):
-        """Test missing text field returns validation error."""
-        response = await client.post('/jobs', json={})
-
-        assert response.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_empty_text_returns_422(self, client):
-        """Test empty text field returns validation error."""
-        response = await client.post('/jobs', json={'text': ''})
+    @pytest.mark.parametrize('body', [
+        pytest.param({}, id='missing-text'),
+        pytest.param({'text': ''}, id='empty-text'),
+    ])
+    async def test_invalid_text_returns_422(self, client, body):
+        """Test missing or empty text returns validation error."""
+        response = await client.post('/jobs', json=body)
 
         assert response.status_code == 422
 
@@ -126,8 +103,6 @@ class TestErrorHandling:
     @pytest.mark.asyncio
     async def test_invalid_voice_id_returns_404(self, client, mock_tts_service):
         """Test invalid voice ID returns 404."""
-        mock_tts_service.get_voice.return_value = None
-
         response = await client.get('/voices/invalid-voice')
 
         assert response.status_code == 404
@@ -139,8 +114,8 @@ class TestConcurrentRequests:
     @pytest.mark.asyncio
     async def test_multiple_jobs_queued_correctly(self, client):
         """Test multiple concurrent job creations are queued."""
-        # Create multiple jobs concurrently
-        texts = [f'Job {i}' for i in range(5)]
+        # Create a burst of jobs concurrently
+        texts = [f'Job {i}' for i in range(50)]
 
         responses = await asyncio.gather(*[
             client.post('/jobs', json={'text': text})
@@ -156,20 +131,22 @@ class TestConcurrentRequests:
         list_response = await client.get('/jobs?limit=100')
         data = list_response.json()
 
+        assert data['total'] == len(texts)
         created_texts = [job['text'] for job in data['jobs']]
         for text in texts:
             assert text in created_texts
 
+        # And each was queued exactly once for processing
+        assert get_job_processor()._queue.qsize() == len(texts)
+
 
 class TestHistoryManagement:
     """Tests for history management."""
 
     @pytest.mark.asyncio
-    async def test_bulk_delete_clears_all_jobs(self, client):
+    async def test_bulk_delete_clears_all_jobs(self, client, seed_jobs):
         """Test DELETE /jobs clears all job history."""
-        # Create some jobs
-        for i in range(3):
-            await client.post('/jobs', json={'text': f'Job {i}'})
+        await seed_jobs([f'Job {i}' for i in range(3)])
 
         # Verify jobs exist
         list_before = await client.get('/jobs')
@@ -217,16 +194,53 @@ class TestAPIDocumentation:
         assert 'paths' in data
         assert 'info' in data
 
-    @pytest.mark.asyncio
-    async def test_openapi_includes_endpoints(self, client):
+    def test_openapi_includes_endpoints(self, app):
         """Test OpenAPI schema includes all endpoints."""
-        response = await client.get('/openapi.json')
-        data = response.json()
-
-        paths = data['paths']
+        # Same schema /openapi.json serves, built once and cached on the app
+        paths = app.openapi()['paths']
         assert '/health' in paths
         assert '/voices' in paths
         assert '/voices/{voice_id}' in paths
         assert '/jobs' in paths
         assert '/jobs/{job_id}' in paths
         assert '/jobs/{job_id}/audio' in paths
+        assert '/jobs/{job_id}/events' in paths
+
+
+class TestWebUI:
+    """Tests for the web UI page."""
+
+    @pytest.mark.asyncio
+    async def test_index_revalidates_with_etag(self, client):
+        """Test GET / sends an ETag and answers a matching If-None-Match with 304."""
+        response = await client.get('/')
+
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/html')
+        etag = response.headers['etag']
+
+        cached = await client.get('/', headers={'If-None-Match': etag})
+
+        assert cached.status_code == 304
+        assert cached.content == b''
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('header', [
+        'W/{etag}',
+        '"other", {etag}',
+        '*',
+    ])
+    async def test_index_revalidates_weak_and_listed_etags(self, client, header):
+        """Test weak tags, tag lists and * in If-None-Match also get a 304."""
+        etag = (await client.get('/')).headers['etag']
+
+        cached = await client.get('/', headers={'If-None-Match': header.format(etag=etag)})
+
+        assert cached.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_index_ignores_stale_etag(self, client):
+        """Test a non-matching If-None-Match gets the full page."""
+        response = await client.get('/', headers={'If-None-Match': '"stale"'})
+
+        assert response.status_code == 200
@@ -0,0 +1,91 @@
+"""
+Tests for batched job inserts.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.job import Job, JobStatus
+from app.services.job_batcher import JobInsertBatcher, get_job_batcher
+
+
+class CountingFactory:
+    """Session factory wrapper that counts the sessions it opens."""
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+        self.sessions_opened = 0
+
+    def __call__(self):
+        self.sessions_opened += 1
+        return self._session_factory()
+
+
+@pytest.fixture
+def counting_factory(test_session_factory):
+    """Counting session factory bound to the test database."""
+    return CountingFactory(test_session_factory)
+
+
+class TestJobInsertBatcher:
+    """Tests for JobInsertBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_insert_returns_pending_job(self, test_session_factory):
+        """Test insert returns a persisted job with id and created_at."""
+        batcher = JobInsertBatcher(test_session_factory)
+
+        job = await batcher.insert('Hello world', 'jerry-seinfeld')
+
+        assert job.id is not None
+        assert job.created_at is not None
+        assert job.status == JobStatus.pending
+        assert job.voice_id == 'jerry-seinfeld'
+
+    @pytest.mark.asyncio
+    async def test_concurrent_inserts_share_one_commit(self, counting_factory, test_session_factory):
+        """Test inserts made in the same tick are committed together."""
+        batcher = JobInsertBatcher(counting_factory)
+
+        jobs = await asyncio.gather(*(batcher.insert(f'Job {i}') for i in range(10)))
+
+        assert counting_factory.sessions_opened == 1
+        assert len({job.id for job in jobs}) == 10
+        async with test_session_factory() as session:
+            count = await session.scalar(
+                select(func.count(Job.id)).where(Job.id.in_([job.id for job in jobs]))
+            )
+            assert count == 10
+
+    @pytest.mark.asyncio
+    async def test_batches_are_capped(self, counting_factory):
+        """Test a burst larger than max_batch is split across commits."""
+        batcher = JobInsertBatcher(counting_factory, max_batch=4)
+
+        await asyncio.gather(*(batcher.insert(f'Job {i}') for i in range(10)))
+
+        assert counting_factory.sessions_opened == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_gives_each_caller_its_own_error(self):
+        """Test a failed commit raises a separate error, chained to the cause, per caller."""
+        cause = OSError('disk full')
+
+        def failing_factory():
+            raise cause
+
+        batcher = JobInsertBatcher(failing_factory)
+
+        results = await asyncio.gather(
+            *(batcher.insert(f'Job {i}') for i in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(error, RuntimeError) for error in results)
+        assert len({id(error) for error in results}) == 3
+        assert all(error.__cause__ is cause for error in results)
+
+    def test_job_batcher_singleton(self):
+        """Test get_job_batcher returns singleton."""
+        assert get_job_batcher() is get_job_batcher()
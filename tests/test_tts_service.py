@@ -4,13 +4,15 @@ Task Group 3: TTS Service Layer Tests
 Tests for TTSService class and voice scanning.
 """
 import asyncio
+import os
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch, AsyncMock
 
 import pytest
 import pytest_asyncio
 
-from app.services.tts_service import TTSService, Voice, get_tts_service, reset_tts_service
+from app.services.tts_service import TTSService, Voice, get_tts_service
 
 
 class TestTTSServiceInitialization:
@@ -23,70 +25,69 @@ class TestTTSServiceInitialization:
         assert service.model is None
         assert service.default_conds is None
         assert service.is_loaded is False
-        assert service._lock is not None
+        assert service._worker is None  # Inference thread starts on first use
 
     def test_tts_service_singleton(self):
         """Test get_tts_service returns singleton instance."""
-        reset_tts_service()
-
         service1 = get_tts_service()
         service2 = get_tts_service()
 
         assert service1 is service2
 
-        reset_tts_service()
-
 
 class TestVoiceScanning:
     """Tests for voice scanning functionality."""
 
-    def test_voice_slug_conversion(self):
+    def test_voice_slug_conversion(self, tmp_path):
         """Test filename stem is used as voice id (no slug conversion)."""
         service = TTSService()
+        (tmp_path / 'Jerry_Seinfeld.wav').touch()
 
-        with patch('app.services.tts_service.VOICES_DIR') as mock_dir:
-            # Mock path with fake wav files
-            mock_file = MagicMock()
-            mock_file.stem = 'Jerry_Seinfeld'
-            mock_file.__str__ = lambda x: '/path/to/Jerry_Seinfeld.wav'
-
-            mock_dir.exists.return_value = True
-            mock_dir.glob.return_value = [mock_file]
-
+        with patch('app.services.tts_service.VOICES_DIR', tmp_path):
             voices = service.scan_voices()
 
             # Check exact filename stem is used as id
             assert 'Jerry_Seinfeld' in voices
 
-    def test_voice_display_name_conversion(self):
+    def test_voice_display_name_conversion(self, tmp_path):
         """Test filename stem is used as display name (no title case conversion)."""
         service = TTSService()
+        (tmp_path / 'Jerry_Seinfeld.wav').touch()
 
-        with patch('app.services.tts_service.VOICES_DIR') as mock_dir:
-            mock_file = MagicMock()
-            mock_file.stem = 'Jerry_Seinfeld'
-            mock_file.__str__ = lambda x: '/path/to/Jerry_Seinfeld.wav'
-
-            mock_dir.exists.return_value = True
-            mock_dir.glob.return_value = [mock_file]
-
+        with patch('app.services.tts_service.VOICES_DIR', tmp_path):
             voices = service.scan_voices()
 
             voice = voices.get('Jerry_Seinfeld')
             assert voice is not None
             assert voice.display_name == 'Jerry_Seinfeld'
 
-    def test_scan_voices_returns_empty_when_no_voices_dir(self):
+    def test_scan_voices_returns_empty_when_no_voices_dir(self, tmp_path):
         """Test scan_voices returns empty dict when voices dir doesn't exist."""
         service = TTSService()
 
-        with patch('app.services.tts_service.VOICES_DIR') as mock_dir:
-            mock_dir.exists.return_value = False
-
+        with patch('app.services.tts_service.VOICES_DIR', tmp_path / 'missing'):
             voices = service.scan_voices()
 
             assert voices == {}
 
+    def test_scan_voices_cached_until_dir_mtime_changes(self, tmp_path):
+        """Test scan_voices reuses its result while the directory is unchanged."""
+        service = TTSService()
+        (tmp_path / 'A.wav').touch()
+        os.utime(tmp_path, ns=(1_000_000_000, 1_000_000_000))
+
+        with patch('app.services.tts_service.VOICES_DIR', tmp_path):
+            first = service.scan_voices()
+            assert service.scan_voices() is first
+
+            # A new file bumps the directory mtime and triggers a rescan
+            (tmp_path / 'B.wav').touch()
+            os.utime(tmp_path, ns=(2_000_000_000, 2_000_000_000))
+            voices = service.scan_voices()
+
+            assert voices is not first
+            assert set(voices) == {'A', 'B'}
+
     def test_get_voices_returns_list(self, voices_dir):
         """Test get_voices returns list of Voice objects."""
         service = TTSService()
@@ -98,6 +99,18 @@ class TestVoiceScanning:
             assert isinstance(voices, list)
             assert len(voices) == 2  # Two voice files in fixture
 
+    def test_get_voice_ids_returns_cached_tuple(self, voices_dir):
+        """Test get_voice_ids returns the same tuple until the next rescan."""
+        service = TTSService()
+
+        with patch('app.services.tts_service.VOICES_DIR', voices_dir):
+            service.scan_voices()
+            ids = service.get_voice_ids()
+
+            assert isinstance(ids, tuple)
+            assert set(ids) == set(service._voices)
+            assert service.get_voice_ids() is ids
+
     def test_get_voice_by_id(self, voices_dir):
         """Test get_voice returns Voice by exact filename stem."""
         service = TTSService()
@@ -121,28 +134,87 @@ class TestVoiceScanning:
             assert voice is None
 
 
-class TestAsyncLock:
-    """Tests for asyncio.Lock in TTSService."""
+class TestInferenceWorker:
+    """Tests for the TTSService inference worker thread."""
+
+    @pytest.mark.asyncio
+    async def test_worker_serializes_generation(self):
+        """Test concurrent generate() calls run one at a time on the worker."""
+        service = TTSService()
+        active = 0
+        max_active = 0
+
+        def fake_generate_sync(text, voice_path):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            time.sleep(0.001)  # Release the GIL so an overlapping call could run
+            active -= 1
+            return text, 24000
+
+        service._generate_sync = fake_generate_sync
+        try:
+            results = await asyncio.gather(
+                service.generate('one'),
+                service.generate('two'),
+            )
+        finally:
+            service.cleanup()
+
+        assert results == [('one', 24000), ('two', 24000)]
+        assert max_active == 1
+
+    @pytest.mark.asyncio
+    async def test_worker_propagates_errors(self):
+        """Test exceptions raised on the worker reach the awaiting caller."""
+        service = TTSService()
+
+        def failing_generate_sync(text, voice_path):
+            raise RuntimeError('model exploded')
+
+        service._generate_sync = failing_generate_sync
+        try:
+            with pytest.raises(RuntimeError, match='model exploded'):
+                await service.generate('boom')
+        finally:
+            service.cleanup()
 
     @pytest.mark.asyncio
-    async def test_lock_prevents_concurrent_generation(self):
-        """Test asyncio.Lock prevents concurrent model access."""
+    async def test_warmup_runs_a_generation(self):
+        """Test warmup() runs one generation through the worker."""
         service = TTSService()
+        service._generate_sync = MagicMock(return_value=(None, 24000))
+        try:
+            await service.warmup()
+        finally:
+            service.cleanup()
+
+        service._generate_sync.assert_called_once_with('warmup', None)
 
-        # Track lock acquisition
-        lock_acquired_times = []
 
-        async def mock_generate():
-            async with service._lock:
-                lock_acquired_times.append(asyncio.get_event_loop().time())
-                await asyncio.sleep(0.1)
+class TestAudioOutput:
+    """Tests for writing generated audio to disk."""
 
-        # Run two concurrent tasks
-        await asyncio.gather(mock_generate(), mock_generate())
+    def test_audio_written_as_rounded_pcm16(self, tmp_path):
+        """Test audio is saved as PCM_16 with samples rounded to the nearest step."""
+        torch = pytest.importorskip('torch')
+        sf = pytest.importorskip('soundfile')
 
-        # The second lock acquisition should be after the first completes
-        assert len(lock_acquired_times) == 2
-        assert lock_acquired_times[1] >= lock_acquired_times[0] + 0.09
+        wav = torch.linspace(-1.0, 1.0, 2001).unsqueeze(0)
+        service = TTSService()
+        service._torch = torch
+        service.model = MagicMock(sr=24000)
+        service.model.generate.return_value = wav
+        output_path = tmp_path / 'out.wav'
+
+        service._generate_to_file_sync('Hello', output_path, None)
+
+        assert sf.info(str(output_path)).subtype == 'PCM_16'
+        samples, sr = sf.read(str(output_path), dtype='int16')
+        assert sr == 24000
+        error = abs(samples - wav.squeeze(0).numpy() * 32767.0)
+        assert error.max() <= 1  # Round-trips within one LSB
+        assert error.max() <= 0.5 + 1e-3  # ...and rounds rather than truncates
 
 
 class TestVoiceClass:
@@ -2,6 +2,9 @@
 Tests for voice scanning functionality.
 Task Group 2: Voice Scanning and Naming
 """
+import asyncio
+import contextlib
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -11,80 +14,124 @@ import pytest
 from app.services.tts_service import TTSService, Voice
 
 
+@pytest.fixture(scope='module')
+def voices_tmp(tmp_path_factory):
+    """Voices directory shared by the read-only naming tests."""
+    voices_path = tmp_path_factory.mktemp('voices')
+    for name in ('TestVoice', 'C3-PO', 'Jerry_Seinfeld'):
+        (voices_path / f'{name}.wav').touch()
+    return voices_path
+
+
 class TestVoiceScanning:
     """Tests for scan_voices() using VOICES_DIR and simplified naming."""
 
-    def test_scan_voices_reads_from_voices_dir(self):
+    def test_scan_voices_reads_from_voices_dir(self, voices_tmp):
         """Test scan_voices() reads from VOICES_DIR (not PROMPTS_DIR)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            voices_path = Path(tmpdir)
+        service = TTSService()
 
-            # Create test voice files
-            (voices_path / 'TestVoice.wav').write_bytes(b'RIFF' + b'\x00' * 40)
+        with patch('app.services.tts_service.VOICES_DIR', voices_tmp):
+            voices = service.scan_voices()
 
-            service = TTSService()
+        # Verify voice was found
+        assert 'TestVoice' in voices
+        assert voices['TestVoice'].file_path == str(voices_tmp / 'TestVoice.wav')
 
-            with patch('app.services.tts_service.VOICES_DIR', voices_path):
-                voices = service.scan_voices()
+    def test_voice_naming_uses_exact_filename_stem(self, voices_tmp):
+        """Test voice naming uses exact filename stem (e.g., C3-PO.wav -> id=C3-PO, display_name=C3-PO)."""
+        service = TTSService()
 
-                # Verify voice was found
-                assert 'TestVoice' in voices
-                assert voices['TestVoice'].file_path == str(voices_path / 'TestVoice.wav')
+        with patch('app.services.tts_service.VOICES_DIR', voices_tmp):
+            voices = service.scan_voices()
 
-    def test_voice_naming_uses_exact_filename_stem(self):
-        """Test voice naming uses exact filename stem (e.g., C3-PO.wav -> id=C3-PO, display_name=C3-PO)."""
+        # Verify exact filename stem is used
+        assert 'C3-PO' in voices
+        voice = voices['C3-PO']
+        assert voice.id == 'C3-PO'
+        assert voice.display_name == 'C3-PO'
+
+    def test_underscores_preserved_in_voice_names(self, voices_tmp):
+        """Test underscores are preserved (e.g., Jerry_Seinfeld.wav -> Jerry_Seinfeld)."""
+        service = TTSService()
+
+        with patch('app.services.tts_service.VOICES_DIR', voices_tmp):
+            voices = service.scan_voices()
+
+        # Verify underscores are preserved
+        assert 'Jerry_Seinfeld' in voices
+        voice = voices['Jerry_Seinfeld']
+        assert voice.id == 'Jerry_Seinfeld'
+        assert voice.display_name == 'Jerry_Seinfeld'
+
+    def test_directories_named_like_voices_are_skipped(self):
+        """Test a directory ending in .wav is not listed as a voice."""
         with tempfile.TemporaryDirectory() as tmpdir:
             voices_path = Path(tmpdir)
-
-            # Create test voice file with mixed case and special characters
-            (voices_path / 'C3-PO.wav').write_bytes(b'RIFF' + b'\x00' * 40)
+            (voices_path / 'Real.wav').touch()
+            (voices_path / 'Folder.wav').mkdir()
 
             service = TTSService()
 
             with patch('app.services.tts_service.VOICES_DIR', voices_path):
                 voices = service.scan_voices()
 
-                # Verify exact filename stem is used
-                assert 'C3-PO' in voices
-                voice = voices['C3-PO']
-                assert voice.id == 'C3-PO'
-                assert voice.display_name == 'C3-PO'
+                assert list(voices) == ['Real']
 
-    def test_underscores_preserved_in_voice_names(self):
-        """Test underscores are preserved (e.g., Jerry_Seinfeld.wav -> Jerry_Seinfeld)."""
+    @pytest.mark.asyncio
+    async def test_watch_voices_rescans_on_change(self):
+        """Test watch_voices() picks up voice files added after startup."""
         with tempfile.TemporaryDirectory() as tmpdir:
             voices_path = Path(tmpdir)
-
-            # Create test voice file with underscores
-            (voices_path / 'Jerry_Seinfeld.wav').write_bytes(b'RIFF' + b'\x00' * 40)
-
             service = TTSService()
 
             with patch('app.services.tts_service.VOICES_DIR', voices_path):
-                voices = service.scan_voices()
+                watcher = asyncio.create_task(service.watch_voices())
+                try:
+                    await asyncio.sleep(0.2)  # Let the watcher start
+                    (voices_path / 'NewVoice.wav').touch()
+
+                    for _ in range(100):
+                        if service.get_voice('NewVoice'):
+                            break
+                        await asyncio.sleep(0.1)
+
+                    assert service.get_voice('NewVoice') is not None
+                finally:
+                    watcher.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await watcher
+
+    @pytest.mark.asyncio
+    async def test_watch_voices_rescans_when_mtime_unchanged(self, tmp_path):
+        """Test a change event rescans even if the directory mtime didn't move."""
+        async def fake_awatch(path):
+            # Add a voice, then put the mtime back as a coarse filesystem would
+            stat = path.stat()
+            (path / 'NewVoice.wav').touch()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            yield {('added', str(path / 'NewVoice.wav'))}
 
-                # Verify underscores are preserved
-                assert 'Jerry_Seinfeld' in voices
-                voice = voices['Jerry_Seinfeld']
-                assert voice.id == 'Jerry_Seinfeld'
-                assert voice.display_name == 'Jerry_Seinfeld'
-
-    def test_voices_endpoint_calls_scan_voices_on_request(self):
-        """Test /voices endpoint calls scan_voices() on each request."""
         service = TTSService()
-        scan_call_count = 0
-        original_scan = service.scan_voices
 
-        def counting_scan():
-            nonlocal scan_call_count
-            scan_call_count += 1
-            return original_scan()
+        with patch('app.services.tts_service.VOICES_DIR', tmp_path), \
+             patch('app.services.tts_service.awatch', fake_awatch):
+            await service.watch_voices()
+
+        assert service.get_voice('NewVoice') is not None
+
+    @pytest.mark.asyncio
+    async def test_watcher_failure_logged_when_it_happens(self, caplog):
+        """Test a voices watcher that dies is logged straight away, not at shutdown."""
+        from server import _log_watcher_failure
 
-        service.scan_voices = counting_scan
+        async def failing_watch():
+            raise OSError('inotify watch limit reached')
 
-        # Simulate multiple requests to get_voices
-        # In actual implementation, the /voices endpoint should call scan_voices
-        service.scan_voices()
-        service.scan_voices()
+        watcher = asyncio.create_task(failing_watch())
+        watcher.add_done_callback(_log_watcher_failure)
+        with contextlib.suppress(OSError):
+            await watcher
+        await asyncio.sleep(0)  # Done callbacks run on the next loop iteration
 
-        assert scan_call_count == 2
+        assert 'Voices watcher stopped' in caplog.text
+        assert 'inotify watch limit reached' in caplog.text